@@ -3,6 +3,7 @@
 支持模拟账户和真实账户的自动切换
 """
 import os
+import sys
 from typing import Optional
 from longport.openapi import Config
 from dotenv import load_dotenv
@@ -118,6 +119,17 @@ class LongPortConfigLoader:
         """是否为模拟运行模式（不实际下单）"""
         return os.getenv("LONGPORT_DRY_RUN", "true").lower() == "true"
 
+    def is_quiet(self) -> bool:
+        """是否为静默模式（跳过下单/撤单/改单的终端表格输出）；未配置时无 TTY 即静默"""
+        value = os.getenv("LONGPORT_QUIET")
+        if value is None:
+            return not sys.stdout.isatty()
+        return value.lower() == "true"
+
+    def is_prefetch_enabled(self) -> bool:
+        """下单成功后是否后台预取当日订单与余额（每次下单额外 2 次交易 API 请求，占用限流额度，默认关闭）"""
+        return os.getenv("LONGPORT_PREFETCH", "false").lower() == "true"
+
 def load_longport_config(mode: Optional[str] = None) -> Config:
     """
     快捷函数：加载长桥配置
@@ -138,8 +150,6 @@ def load_longport_config(mode: Optional[str] = None) -> Config:
 
 if __name__ == "__main__":
     # 测试配置加载
-    import sys
-    
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(levelname)s - %(message)s'
@@ -3,13 +3,18 @@
 支持模拟账户和真实账户，带风险控制和 dry_run 模式
 """
 from decimal import Decimal
-from typing import Dict, Optional, List
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Optional, List, Tuple
 import io
 import logging
+import threading
 import time
 import os
+import re
 import sys
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 
 from longport.openapi import TradeContext, QuoteContext, Config, OrderSide, OrderType, TimeInForceType, OrderStatus, Market
 
@@ -19,6 +24,7 @@ from .order_formatter import (
     print_order_submitting_display,
     print_order_submitted_display,
     print_order_push_submitted_display,
+    register_trade_order,
     print_order_modify_table,
     print_order_cancel_table,
     print_orders_summary_table,
@@ -34,9 +40,64 @@ from .order_formatter import (
 
 logger = logging.getLogger(__name__)
 
+# 已带市场后缀的代码不再追加 .US（str.endswith 支持元组，一次 C 调用完成判断）
+_MARKET_SUFFIXES = (".US", ".HK")
+
+
+# 单笔期权订单总价上限（进程内环境变量不变，导入时解析一次；需要重新读取时调用 reload_env）
+_MAX_OPTION_TOTAL_PRICE = float(os.getenv('MAX_OPTION_TOTAL_PRICE', '10000'))
+
+
+def reload_env() -> None:
+    """重新读取本模块缓存的环境变量配置。"""
+    global _MAX_OPTION_TOTAL_PRICE
+    _MAX_OPTION_TOTAL_PRICE = float(os.getenv('MAX_OPTION_TOTAL_PRICE', '10000'))
+
+
+# 卖出前持仓检查复用最近一次 get_positions 结果的有效期（秒）
+_POSITIONS_CACHE_TTL = 1.0
+
+# 下单成功后后台预取当日订单/余额的结果有效期（秒），且只被下一次调用消费一次
+_PREFETCH_TTL = 1.0
+
+# 后台 I/O 线程池：下单后预取等不影响主流程的 SDK 请求
+_IO_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="longport-io")
+
+
+def _normalize_symbol(symbol: str) -> str:
+    """确保代码带有市场后缀，无后缀时默认补 .US。"""
+    return symbol if symbol.endswith(_MARKET_SUFFIXES) else symbol + ".US"
+
+
+@lru_cache(maxsize=2048, typed=True)
+def _to_decimal(value) -> Decimal:
+    """数值转 Decimal（经 str 避免浮点误差）；Decimal 不可变，常见价格/比例直接复用缓存实例。"""
+    return Decimal(str(value))
+
+
+def _to_dec(value) -> Optional[Decimal]:
+    """同 _to_decimal，None 原样返回以便参数字典统一过滤。"""
+    return None if value is None else _to_decimal(value)
+
+
+def _parse_yymmdd(s: str) -> date:
+    """解析定长 YYMMDD 字符串为 date（避免 strptime 的格式解析开销）。"""
+    return date(2000 + int(s[0:2]), int(s[2:4]), int(s[4:6]))
+
+
+def _fmt_yymmdd(d: date) -> str:
+    """将 date 格式化为 YYMMDD 字符串。"""
+    return f"{d.year % 100:02d}{d.month:02d}{d.day:02d}"
+
 
 class LongPortBroker:
     """长桥证券交易接口"""
+
+    # 账户模式展示文案（键为 LongPortConfigLoader 的模式字符串）
+    _MODE_DISPLAYS = {
+        LongPortConfigLoader.PAPER_MODE: "🧪 模拟账户",
+        LongPortConfigLoader.REAL_MODE: "💰 真实账户",
+    }
     
     def __init__(self, config: Optional[Config] = None, config_loader: Optional[LongPortConfigLoader] = None):
         """
@@ -63,17 +124,41 @@ class LongPortBroker:
             sys.stderr = _old_stderr
         self.ctx = TradeContext(self.config)
         self.positions: Dict[str, Dict] = {}  # 持仓跟踪
+        # 最近一次 get_positions 结果按 symbol 索引，供卖出检查短时复用，避免重复请求
+        self._positions_by_symbol: Dict[str, Dict] = {}
+        self._positions_ts: float = 0.0
+        # 下单后后台预取的 (monotonic 时间戳, 结果)，None 表示无可用预取
+        self._orders_cache: Optional[Tuple[float, list]] = None
+        self._balance_cache: Optional[Tuple[float, dict]] = None
+        self._prefetch_inflight = False
+        # 预取代次：invalidate_prefetch 时递增，执行中的预取发现代次变化即丢弃结果
+        self._prefetch_generation = 0
 
         # 模式标志
         self.dry_run = config_loader.is_dry_run()
         self.auto_trade = config_loader.is_auto_trade_enabled()
         self.is_paper = config_loader.is_paper_mode()
+        # 账户模式字符串在实例生命周期内不变，构造一次供订单/展示复用
+        self._mode_str = LongPortConfigLoader.PAPER_MODE if self.is_paper else LongPortConfigLoader.REAL_MODE
+        self._mode_display = self._MODE_DISPLAYS[self._mode_str]
+        # 静默模式：跳过下单路径上的 Rich 渲染（错误输出不受影响）
+        self.quiet = config_loader.is_quiet()
+        # 下单后预取：每次下单额外请求当日订单与余额，默认关闭
+        self.prefetch = config_loader.is_prefetch_enabled()
         self._quote_std_suppressed = False  # 仅首次行情请求时用 dup2 屏蔽 SDK 打印的订阅表
+        self._quote_std_lock = threading.Lock()  # 并发行情请求时保证 fd 屏蔽/恢复只执行一次
 
     def _with_fd_std_suppressed(self, func, *args, **kwargs):
         """在屏蔽 fd 1/2 的情况下执行 func，用于屏蔽长桥 SDK 直接写 fd 的行情订阅表。仅首次调用时执行屏蔽。"""
         if self._quote_std_suppressed:
             return func(*args, **kwargs)
+        with self._quote_std_lock:
+            if self._quote_std_suppressed:
+                return func(*args, **kwargs)
+            return self._call_fd_std_suppressed(func, *args, **kwargs)
+
+    def _call_fd_std_suppressed(self, func, *args, **kwargs):
+        """实际执行 fd 1/2 屏蔽并调用 func，调用方需持有 _quote_std_lock。"""
         try:
             devnull = os.open(os.devnull, os.O_WRONLY)
             save_1, save_2 = os.dup(1), os.dup(2)
@@ -147,6 +232,8 @@ class LongPortBroker:
             logger.info(f"🧪 [DRY RUN] 模拟下单: {symbol} {side} {quantity} @ {price}")
             return self._mock_order_response(symbol, side, quantity, price)
         
+        # 默认备注只生成一次，订单参数、展示信息与失败信息共用
+        _remark = remark or f"Auto trade via OpenAPI - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         try:
             # 卖出时检查持仓（LIT 条件单不立即卖出，跳过持仓检查）
             if side.upper() == "SELL" and order_type.upper() != "LIT":
@@ -164,35 +251,30 @@ class LongPortBroker:
                 o_type = OrderType.LIT
                 if price is None:
                     raise ValueError("触价限价单必须提供限价")
-                submitted_price = Decimal(str(price))
+                submitted_price = _to_decimal(price)
             else:
                 o_type = OrderType.LO
                 if price is None:
                     raise ValueError("限价单必须提供价格")
-                submitted_price = Decimal(str(price))
+                submitted_price = _to_decimal(price)
             
             # LIT 订单使用 GoodTilCanceled（撤销前有效），其余用 Day
             tif = TimeInForceType.GoodTilCanceled if o_type == OrderType.LIT else TimeInForceType.Day
 
-            # 准备订单参数
-            order_params = {
+            # 准备订单参数（止盈止损参数未设置时为 None，一次性过滤掉）
+            order_params = {k: v for k, v in {
                 "side": order_side,
                 "symbol": symbol,
                 "order_type": o_type,
                 "submitted_price": submitted_price,
                 "submitted_quantity": quantity,
                 "time_in_force": tif,
-                "remark": remark or f"Auto trade via OpenAPI - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-            }
-            
-            # 添加止盈止损参数
-            if trigger_price:
-                order_params["trigger_price"] = Decimal(str(trigger_price))
-            if trailing_percent:
-                order_params["trailing_percent"] = Decimal(str(trailing_percent))
-            if trailing_amount:
-                order_params["trailing_amount"] = Decimal(str(trailing_amount))
-                
+                "remark": _remark,
+                "trigger_price": _to_dec(trigger_price or None),
+                "trailing_percent": _to_dec(trailing_percent or None),
+                "trailing_amount": _to_dec(trailing_amount or None),
+            }.items() if v is not None}
+
             order_info = {
                 "symbol": symbol,
                 "side": side,
@@ -200,19 +282,22 @@ class LongPortBroker:
                 "price": float(price) if price else None,
                 "status": "submitted",
                 "submitted_at": datetime.now().isoformat(),
-                "mode": "paper" if self.is_paper else "real",
+                "mode": self._mode_str,
                 "trigger_price": trigger_price,
                 "trailing_percent": trailing_percent,
                 "trailing_amount": trailing_amount,
-                "remark": remark or f"Auto trade via OpenAPI - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                "remark": _remark,
                 "instruction_timestamp": instruction_timestamp,
             }
             # 以即将调用 submit_order 的此刻（t0）作为「提交订单」时间点
-            print_order_submitting_display(order_info)
+            if not self.quiet:
+                print_order_submitting_display(order_info)
             t0 = time.perf_counter()
             resp = self.ctx.submit_order(**order_params)
             order_info["_timing_submit_api_ms"] = (time.perf_counter() - t0) * 1000
+            self._positions_ts = 0.0  # 可用持仓已变化，下次检查重新拉取
             order_info["order_id"] = getattr(resp, "order_id", None) or getattr(resp, "id", None) or (str(resp) if resp else None)
+            self._schedule_prefetch()
             return order_info
             
         except ValueError as e:
@@ -222,8 +307,8 @@ class LongPortBroker:
                 "side": side,
                 "quantity": quantity,
                 "price": float(price) if price else None,
-                "mode": "paper" if self.is_paper else "real",
-                "remark": remark or f"Auto trade via OpenAPI - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                "mode": self._mode_str,
+                "remark": _remark
             }
             
             # 使用红色边框表格展示失败订单
@@ -266,12 +351,13 @@ class LongPortBroker:
             
             # 撤销订单（API不返回值或返回None）
             self.ctx.cancel_order(order_id)
+            self._positions_ts = 0.0  # 可用持仓已变化，下次检查重新拉取
             
             result = {
                 "order_id": order_id,
                 "status": "cancelled",
                 "cancelled_at": datetime.now().isoformat(),
-                "mode": "paper" if self.is_paper else "real"
+                "mode": self._mode_str
             }
             
             # 如果找到原订单信息，添加到结果中
@@ -284,8 +370,9 @@ class LongPortBroker:
                 })
             
             # 使用彩色表格输出
-            print_success_message("订单撤销成功")
-            print_order_cancel_table(result, "撤销订单详情")
+            if not self.quiet:
+                print_success_message("订单撤销成功")
+                print_order_cancel_table(result)
             
             return result
             
@@ -350,29 +437,24 @@ class LongPortBroker:
             quantity_decimal = Decimal(int(quantity)) if quantity is not None else Decimal(int(old_order.get("quantity", 0)))
             price_val = price if price is not None else old_order.get("price")
             if price_val is not None:
-                price_val = Decimal(str(price_val))
+                price_val = _to_decimal(price_val)
 
             # 准备修改参数（API 要求 quantity、price 必填，缺一不可）
             if price_val is None:
                 raise ValueError("原订单无价格信息，无法修改订单（长桥要求替换时必传 price）")
-            replace_params = {
+            replace_params = {k: v for k, v in {
                 "order_id": order_id,
                 "quantity": quantity_decimal,
                 "price": price_val,
-            }
-
-            # 添加可选参数
-            if trigger_price is not None:
-                replace_params["trigger_price"] = Decimal(str(trigger_price))
-            if trailing_percent is not None:
-                replace_params["trailing_percent"] = Decimal(str(trailing_percent))
-            if trailing_amount is not None:
-                replace_params["trailing_amount"] = Decimal(str(trailing_amount))
-            if remark:
-                replace_params["remark"] = remark
+                "trigger_price": _to_dec(trigger_price),
+                "trailing_percent": _to_dec(trailing_percent),
+                "trailing_amount": _to_dec(trailing_amount),
+                "remark": remark or None,
+            }.items() if v is not None}
             
             # 修改订单
             self.ctx.replace_order(**replace_params)
+            self._positions_ts = 0.0  # 可用持仓已变化，下次检查重新拉取
             
             # 新值字典
             new_values = {
@@ -389,12 +471,13 @@ class LongPortBroker:
                 "price": float(price) if price else None,
                 "status": "replaced",
                 "replaced_at": datetime.now().isoformat(),
-                "mode": "paper" if self.is_paper else "real"
+                "mode": self._mode_str
             }
             
             # 使用彩色表格输出修改对比
-            print_success_message("订单修改成功")
-            print_order_modify_table(order_id, old_order, new_values, "订单修改详情")
+            if not self.quiet:
+                print_success_message("订单修改成功")
+                print_order_modify_table(order_id, old_order, new_values)
             
             return result
             
@@ -434,20 +517,16 @@ class LongPortBroker:
             bool: 是否有足够持仓
         """
         try:
-            # 获取持仓信息
-            positions = self.get_positions()
-            
-            # 查找目标股票的持仓
-            target_position = None
-            for pos in positions:
-                if pos['symbol'] == symbol:
-                    target_position = pos
-                    break
+            # 获取持仓信息：调用方刚查询过持仓时直接复用，否则重新拉取
+            if time.monotonic() - self._positions_ts >= _POSITIONS_CACHE_TTL:
+                self.get_positions()
+            target_position = self._positions_by_symbol.get(symbol)
             
             # 没有持仓
             if not target_position:
                 logger.warning(f"❌ 没有持仓: {symbol}")
-                print_warning_message(f"无法卖出 {symbol}: 没有持仓")
+                if not self.quiet:
+                    print_warning_message(f"无法卖出 {symbol}: 没有持仓")
                 return False
             
             # 可用数量不足
@@ -457,10 +536,11 @@ class LongPortBroker:
                     f"❌ 持仓数量不足: {symbol} "
                     f"可用 {available_quantity} < 卖出 {quantity}"
                 )
-                print_warning_message(
-                    f"无法卖出 {quantity} 股 {symbol}: "
-                    f"可用持仓仅 {available_quantity} 股"
-                )
+                if not self.quiet:
+                    print_warning_message(
+                        f"无法卖出 {quantity} 股 {symbol}: "
+                        f"可用持仓仅 {available_quantity} 股"
+                    )
                 return False
             
             return True
@@ -469,18 +549,75 @@ class LongPortBroker:
             logger.error(f"持仓检查失败: {e}")
             return False
     
+    def _schedule_prefetch(self):
+        """
+        下单成功后在后台预取当日订单和账户余额；已有预取在执行时不重复提交。
+        每次预取额外发出 2 次交易 API 请求，仅在 LONGPORT_PREFETCH=true 时启用。
+        """
+        if not self.prefetch or self._prefetch_inflight:
+            return
+        self._prefetch_inflight = True
+        try:
+            _IO_POOL.submit(self._prefetch_after_submit, self._prefetch_generation)
+        except RuntimeError:
+            # 解释器退出时线程池已关闭
+            self._prefetch_inflight = False
+
+    def _prefetch_after_submit(self, generation: int):
+        """后台线程：拉取当日订单与余额并写入预取缓存；期间收到订单推送（代次变化）则丢弃结果。"""
+        try:
+            orders = self._fetch_today_orders()
+            balance = self._fetch_account_balance()
+            if generation != self._prefetch_generation:
+                return
+            self._orders_cache = (time.monotonic(), orders)
+            self._balance_cache = (time.monotonic(), balance)
+            # 写入与推送回调可能交错：写入后代次已变化则撤回本次结果
+            if generation != self._prefetch_generation:
+                self._orders_cache = None
+                self._balance_cache = None
+        except Exception as e:
+            logger.debug(f"下单后预取失败: {e}")
+        finally:
+            self._prefetch_inflight = False
+
+    def invalidate_prefetch(self):
+        """丢弃预取结果（收到订单状态推送时调用，避免读到推送前的订单/余额快照）。"""
+        self._prefetch_generation += 1
+        self._orders_cache = None
+        self._balance_cache = None
+
+    @staticmethod
+    def _take_prefetched(cached):
+        """预取结果在有效期内且非空时返回，否则返回 None。"""
+        if cached is None:
+            return None
+        ts, value = cached
+        if value and time.monotonic() - ts < _PREFETCH_TTL:
+            return value
+        return None
+
     def get_today_orders(self) -> list:
-        """获取当日订单"""
+        """获取当日订单（优先消费下单后的后台预取结果）"""
+        cached, self._orders_cache = self._orders_cache, None
+        orders = self._take_prefetched(cached)
+        if orders is not None:
+            return orders
+        return self._fetch_today_orders()
+
+    def _fetch_today_orders(self) -> list:
+        """请求 SDK 获取当日订单"""
         try:
             orders = self.ctx.today_orders()
+            _f, _buy = float, OrderSide.Buy
             return [
                 {
                     "order_id": order.order_id,
                     "symbol": order.symbol,
-                    "side": "BUY" if order.side == OrderSide.Buy else "SELL",
+                    "side": "BUY" if order.side == _buy else "SELL",
                     "quantity": order.quantity,
                     "executed_quantity": order.executed_quantity,
-                    "price": float(order.price) if order.price else None,
+                    "price": _f(order.price) if order.price else None,
                     "status": str(order.status),
                     "submitted_at": order.submitted_at.isoformat()
                 }
@@ -523,28 +660,42 @@ class LongPortBroker:
         """获取持仓信息"""
         try:
             response = self.ctx.stock_positions()
-            # response.channels 是一个列表，每个元素包含 account_channel 和 positions
-            positions = []
-            for channel in response.channels:
-                for pos in channel.positions:
-                    positions.append({
-                        "symbol": pos.symbol,
-                        "symbol_name": pos.symbol_name,
-                        "quantity": float(pos.quantity),
-                        "available_quantity": float(pos.available_quantity),
-                        "cost_price": float(pos.cost_price),
-                        "currency": pos.currency,
-                        "market": str(pos.market)
-                    })
+            # response.channels 是一个列表，每个元素包含 account_channel 和 positions，展平后一次构建
+            _f = float
+            positions = [
+                {
+                    "symbol": pos.symbol,
+                    "symbol_name": pos.symbol_name,
+                    "quantity": _f(pos.quantity),
+                    "available_quantity": _f(pos.available_quantity),
+                    "cost_price": _f(pos.cost_price),
+                    "currency": pos.currency,
+                    "market": str(pos.market)
+                }
+                for pos in chain.from_iterable(c.positions for c in response.channels)
+            ]
+            self._positions_by_symbol = {p["symbol"]: p for p in positions}
+            self._positions_ts = time.monotonic()
             return positions
         except Exception as e:
             logger.error(f"获取持仓失败: {e}")
+            self._positions_by_symbol = {}
+            self._positions_ts = 0.0
             return []
     
     def get_account_balance(self) -> dict:
         """获取账户余额，通过 account_balance(currency=\"USD\") 指定币种为 USD。
         总资产=net_assets，现金=available_cash+frozen_cash，可用现金=available_cash。
+        下单后短时间内优先消费后台预取结果。
         """
+        cached, self._balance_cache = self._balance_cache, None
+        balance = self._take_prefetched(cached)
+        if balance is not None:
+            return balance
+        return self._fetch_account_balance()
+
+    def _fetch_account_balance(self) -> dict:
+        """请求 SDK 获取 USD 账户余额"""
         try:
             balance = self.ctx.account_balance(currency="USD")
             if not balance:
@@ -554,7 +705,7 @@ class LongPortBroker:
                     "net_assets": 0.0,
                     "total_cash": 0.0,
                     "currency": "USD",
-                    "mode": "paper" if self.is_paper else "real"
+                    "mode": self._mode_str
                 }
             b = balance[0]
             cash_infos = b.cash_infos or []
@@ -568,7 +719,7 @@ class LongPortBroker:
                 "net_assets": net_assets,
                 "total_cash": net_assets,
                 "currency": "USD",
-                "mode": "paper" if self.is_paper else "real"
+                "mode": self._mode_str
             }
         except Exception as e:
             logger.error(f"获取账户余额失败: {e}")
@@ -585,10 +736,8 @@ class LongPortBroker:
             
             # 获取持仓信息（用于计算持仓市值）
             positions = self.get_positions()
-            position_value = sum(
-                pos.get('quantity', 0) * pos.get('cost_price', 0) 
-                for pos in positions
-            )
+            # get_positions 构建的每条持仓都带 quantity/cost_price，直接下标取值
+            position_value = sum(pos['quantity'] * pos['cost_price'] for pos in positions)
             
             # 组合账户信息
             account_info = {
@@ -597,7 +746,7 @@ class LongPortBroker:
             }
             
             # 使用表格格式化输出
-            mode_display = "🧪 模拟账户" if self.is_paper else "💰 真实账户"
+            mode_display = self._mode_display
             print_account_info_table(account_info, title=f"账户信息 ({mode_display})")
             
         except Exception as e:
@@ -617,7 +766,7 @@ class LongPortBroker:
                 return
             
             # 使用表格格式化输出
-            mode_display = "🧪 模拟账户" if self.is_paper else "💰 真实账户"
+            mode_display = self._mode_display
             print_positions_table(positions, title=f"持仓信息 ({mode_display})")
             
         except Exception as e:
@@ -637,7 +786,7 @@ class LongPortBroker:
                 return
             
             # 使用表格格式化输出
-            mode_display = "🧪 模拟账户" if self.is_paper else "💰 真实账户"
+            mode_display = self._mode_display
             print_orders_summary_table(orders, title=f"当日订单 ({mode_display})")
             
         except Exception as e:
@@ -656,18 +805,14 @@ class LongPortBroker:
         """
         try:
             # 确保symbol带有市场后缀
-            if not symbol.endswith('.US'):
-                symbol = f"{symbol}.US"
+            symbol = _normalize_symbol(symbol)
             
             resp = self._with_fd_std_suppressed(
                 self.quote_ctx.option_chain_expiry_date_list, symbol
             )
             
             # 转换 datetime.date 对象为 YYMMDD 字符串
-            expiry_dates = []
-            for date_obj in resp:
-                date_str = date_obj.strftime("%y%m%d")
-                expiry_dates.append(date_str)
+            expiry_dates = [_fmt_yymmdd(d) for d in resp]
             
             logger.info(f"获取 {symbol} 期权到期日: {len(expiry_dates)} 个")
             return expiry_dates
@@ -687,14 +832,11 @@ class LongPortBroker:
             期权链信息字典，包含看涨和看跌期权的行权价和代码
         """
         try:
-            from datetime import datetime
-            
             # 确保symbol带有市场后缀
-            if not symbol.endswith('.US'):
-                symbol = f"{symbol}.US"
+            symbol = _normalize_symbol(symbol)
             
             # 将 YYMMDD 字符串转换为 datetime.date 对象
-            date_obj = datetime.strptime(expiry_date, "%y%m%d").date()
+            date_obj = _parse_yymmdd(expiry_date)
             
             # 获取期权链
             resp = self._with_fd_std_suppressed(
@@ -739,28 +881,38 @@ class LongPortBroker:
         try:
             resp = self._with_fd_std_suppressed(self.quote_ctx.option_quote, symbols)
             
+            # 同一次返回的报价类型一致，只需探测首个元素是否带扩展信息
+            _g, _f = getattr, float
+            has_extend = bool(resp) and hasattr(resp[0], 'extend')
             quotes = []
             for quote in resp:
                 # 构建基础报价信息
+                last_done = quote.last_done
+                open_ = _g(quote, 'open', None)
+                high = _g(quote, 'high', None)
+                low = _g(quote, 'low', None)
                 quote_data = {
                     "symbol": quote.symbol,
-                    "last_done": float(quote.last_done) if quote.last_done else 0,
-                    "open": float(quote.open) if hasattr(quote, 'open') and quote.open else 0,
-                    "high": float(quote.high) if hasattr(quote, 'high') and quote.high else 0,
-                    "low": float(quote.low) if hasattr(quote, 'low') and quote.low else 0,
+                    "last_done": _f(last_done) if last_done else 0,
+                    "open": _f(open_) if open_ else 0,
+                    "high": _f(high) if high else 0,
+                    "low": _f(low) if low else 0,
                     "volume": int(quote.volume) if quote.volume else 0,
                 }
                 
                 # 获取期权扩展信息
-                if hasattr(quote, 'extend') and quote.extend:
-                    extend = quote.extend
-                    quote_data.update({
-                        "open_interest": int(extend.open_interest) if hasattr(extend, 'open_interest') and extend.open_interest else 0,
-                        "implied_volatility": float(extend.implied_volatility) if hasattr(extend, 'implied_volatility') and extend.implied_volatility else 0,
-                        "strike_price": float(extend.strike_price) if hasattr(extend, 'strike_price') and extend.strike_price else 0,
-                        "contract_type": str(extend.contract_type) if hasattr(extend, 'contract_type') else "",
-                        "direction": str(extend.direction) if hasattr(extend, 'direction') else "",
-                    })
+                extend = quote.extend if has_extend else None
+                if extend:
+                    oi = _g(extend, 'open_interest', None)
+                    iv = _g(extend, 'implied_volatility', None)
+                    strike = _g(extend, 'strike_price', None)
+                    contract_type = _g(extend, 'contract_type', None)
+                    direction = _g(extend, 'direction', None)
+                    quote_data["open_interest"] = int(oi) if oi else 0
+                    quote_data["implied_volatility"] = _f(iv) if iv else 0
+                    quote_data["strike_price"] = _f(strike) if strike else 0
+                    quote_data["contract_type"] = str(contract_type) if contract_type is not None else ""
+                    quote_data["direction"] = str(direction) if direction is not None else ""
                 
                 quotes.append(quote_data)
             
@@ -781,30 +933,27 @@ class LongPortBroker:
         """
         try:
             # 确保所有symbol都带有市场后缀
-            symbols_with_market = []
-            for symbol in symbols:
-                if not symbol.endswith('.US') and not symbol.endswith('.HK'):
-                    symbol = f"{symbol}.US"
-                symbols_with_market.append(symbol)
+            symbols_with_market = [_normalize_symbol(s) for s in symbols]
             
             resp = self._with_fd_std_suppressed(
                 self.quote_ctx.quote, symbols_with_market
             )
             
-            quotes = []
-            for quote in resp:
-                quote_data = {
+            _f = float
+            quotes = [
+                {
                     "symbol": quote.symbol,
-                    "last_done": float(quote.last_done) if quote.last_done else 0,
-                    "prev_close": float(quote.prev_close) if quote.prev_close else 0,
-                    "open": float(quote.open) if quote.open else 0,
-                    "high": float(quote.high) if quote.high else 0,
-                    "low": float(quote.low) if quote.low else 0,
+                    "last_done": _f(quote.last_done) if quote.last_done else 0,
+                    "prev_close": _f(quote.prev_close) if quote.prev_close else 0,
+                    "open": _f(quote.open) if quote.open else 0,
+                    "high": _f(quote.high) if quote.high else 0,
+                    "low": _f(quote.low) if quote.low else 0,
                     "volume": int(quote.volume) if quote.volume else 0,
-                    "turnover": float(quote.turnover) if quote.turnover else 0,
-                    "timestamp": quote.timestamp if hasattr(quote, 'timestamp') else None,
+                    "turnover": _f(quote.turnover) if quote.turnover else 0,
+                    "timestamp": getattr(quote, 'timestamp', None),
                 }
-                quotes.append(quote_data)
+                for quote in resp
+            ]
             
             logger.debug(f"获取 {len(quotes)} 个正股报价")
             return quotes
@@ -845,20 +994,27 @@ class LongPortBroker:
         if not self.auto_trade:
             logger.warning("⚠️  自动交易未启用，跳过订单提交")
             mock = self._mock_order_response(symbol, side, quantity, price)
-            print_order_submitted_display(mock, multiplier=1)
+            if not self.quiet:
+                print_order_submitted_display(mock, multiplier=1)
+            else:
+                register_trade_order(mock)
             return mock
         
         # Dry run 模式
         if self.dry_run:
             logger.info(f"🧪 [DRY RUN] 模拟下单: {symbol} {side} {quantity} @ {price}")
             mock = self._mock_order_response(symbol, side, quantity, price)
-            print_order_submitted_display(mock, multiplier=1)
+            if not self.quiet:
+                print_order_submitted_display(mock, multiplier=1)
+            else:
+                register_trade_order(mock)
             return mock
         
+        # 默认备注只生成一次，订单参数、展示信息与失败信息共用
+        _remark = remark or f"Auto trade via OpenAPI - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         try:
             # 确保symbol带有市场后缀
-            if not symbol.endswith('.US') and not symbol.endswith('.HK'):
-                symbol = f"{symbol}.US"
+            symbol = _normalize_symbol(symbol)
             
             # 卖出时检查持仓
             if side.upper() == "SELL":
@@ -876,52 +1032,51 @@ class LongPortBroker:
                 o_type = OrderType.LO
                 if price is None:
                     raise ValueError("限价单必须提供价格")
-                submitted_price = Decimal(str(price))
+                submitted_price = _to_decimal(price)
             
-            # 准备订单参数
-            order_params = {
+            # 准备订单参数（止盈止损参数未设置时为 None，一次性过滤掉）
+            order_params = {k: v for k, v in {
                 "side": order_side,
                 "symbol": symbol,
                 "order_type": o_type,
                 "submitted_price": submitted_price,
                 "submitted_quantity": quantity,
                 "time_in_force": TimeInForceType.Day,
-                "remark": remark or f"Auto trade via OpenAPI - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-            }
-            
-            # 添加止盈止损参数
-            if trigger_price:
-                order_params["trigger_price"] = Decimal(str(trigger_price))
-            if trailing_percent:
-                order_params["trailing_percent"] = Decimal(str(trailing_percent))
-            if trailing_amount:
-                order_params["trailing_amount"] = Decimal(str(trailing_amount))
-            
-            # 以即将调用 submit_order 的此刻作为「提交订单」时间点
+                "remark": _remark,
+                "trigger_price": _to_dec(trigger_price or None),
+                "trailing_percent": _to_dec(trailing_percent or None),
+                "trailing_amount": _to_dec(trailing_amount or None),
+            }.items() if v is not None}
+
+            # 以即将调用 submit_order 的此刻作为「提交订单」时间点（同时作为 order_info 的公共字段）
             pre_info = {
                 "symbol": symbol,
                 "side": side,
                 "quantity": quantity,
                 "price": float(price) if price else None,
-                "mode": "paper" if self.is_paper else "real",
+                "mode": self._mode_str,
             }
-            print_order_submitting_display(pre_info, multiplier=1)
+            if not self.quiet:
+                print_order_submitting_display(pre_info, multiplier=1)
             resp = self.ctx.submit_order(**order_params)
+            self._positions_ts = 0.0  # 可用持仓已变化，下次检查重新拉取
+            # 在提交前展示信息的基础上补充订单结果字段，不再重复构建公共字段
             order_info = {
                 "order_id": resp.order_id,
-                "symbol": symbol,
-                "side": side,
-                "quantity": quantity,
-                "price": float(price) if price else None,
+                **pre_info,
                 "status": "submitted",
                 "submitted_at": datetime.now().isoformat(),
-                "mode": "paper" if self.is_paper else "real",
                 "trigger_price": trigger_price,
                 "trailing_percent": trailing_percent,
                 "trailing_amount": trailing_amount,
-                "remark": remark or f"Auto trade via OpenAPI - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                "remark": _remark
             }
-            print_order_push_submitted_display(order_info, multiplier=1)
+            # 静默模式只跳过展示，order_id 仍需注册到交易流程，否则后续成交/拒绝推送会被丢弃
+            if not self.quiet:
+                print_order_push_submitted_display(order_info, multiplier=1)
+            else:
+                register_trade_order(order_info)
+            self._schedule_prefetch()
             return order_info
             
         except ValueError as e:
@@ -931,8 +1086,8 @@ class LongPortBroker:
                 "side": side,
                 "quantity": quantity,
                 "price": float(price) if price else None,
-                "mode": "paper" if self.is_paper else "real",
-                "remark": remark or f"Auto trade via OpenAPI - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                "mode": self._mode_str,
+                "remark": _remark
             }
             
             # 使用红色边框表格展示失败订单
@@ -953,7 +1108,6 @@ def validate_option_expiry(symbol: str) -> None:
     Raises:
         ValueError: 若期权已过期
     """
-    import re
     # 匹配 YYMMDD（6 位数字，在 C 或 P 之前）
     m = re.search(r"(\d{6})[CP]\d+\.US$", symbol, re.IGNORECASE)
     if not m:
@@ -970,6 +1124,56 @@ def validate_option_expiry(symbol: str) -> None:
         )
 
 
+# 周一..周日距下一个周五的天数（当天为周五时取下周五，不为 0）
+_DAYS_TO_NEXT_FRIDAY = (4, 3, 2, 1, 7, 6, 5)
+
+
+def _parse_expiry(expiry: str, now: datetime) -> Tuple[datetime, str]:
+    """
+    解析到期日文本，返回 (到期日 datetime, YYMMDD 字符串)。
+
+    支持 本周/this week、1/31、2月13、2025-01-31、20250131；月日格式早于当前月份时视为次年。
+    """
+    # 处理 "本周" 等中文到期日
+    if expiry in ["本周", "this week"]:
+        # 简化处理：使用本周五，直接由目标日期得到年月日
+        days_until_friday = _DAYS_TO_NEXT_FRIDAY[now.weekday()]
+        target = now + timedelta(days=days_until_friday)
+        expiry_date = datetime(target.year, target.month, target.day)
+        return expiry_date, _fmt_yymmdd(expiry_date)
+
+    # 解析到期日
+    if "/" in expiry:
+        # 格式：1/31 或 01/31
+        m_str, _, d_str = expiry.partition("/")
+        month, day = int(m_str), int(d_str.partition("/")[0])
+    else:
+        # 格式：2025-01-31 定长切片去连字符；20250131 原样使用
+        m_yue_d = None
+        if len(expiry) == 10 and expiry[4] == "-" and expiry[7] == "-":
+            expiry_clean = expiry[0:4] + expiry[5:7] + expiry[8:10]
+        else:
+            expiry_clean = expiry
+        if len(expiry_clean) != 8 or not expiry_clean.isdigit():
+            # 格式：2月13（中文）；其余带连字符写法去掉连字符后再按 8 位数字解析
+            m_yue_d = re.match(r"^(\d{1,2})月(\d{1,2})$", expiry.strip())
+            if not m_yue_d:
+                expiry_clean = expiry.replace("-", "")
+                if len(expiry_clean) != 8 or not expiry_clean.isdigit():
+                    raise ValueError(f"无法解析到期日格式: {expiry!r}，支持 1/31、2月13、2025-01-31、20250131")
+        if m_yue_d is None:
+            year = int(expiry_clean[0:4])
+            month = int(expiry_clean[4:6])
+            day = int(expiry_clean[6:8])
+            return datetime(year, month, day), expiry_clean[2:]  # YYMMDD
+        month, day = int(m_yue_d.group(1)), int(m_yue_d.group(2))
+
+    year = now.year
+    if month < now.month:
+        year += 1
+    return datetime(year, month, day), f"{year % 100:02d}{month:02d}{day:02d}"
+
+
 def convert_to_longport_symbol(ticker: str, option_type: str, strike: float, expiry: str) -> str:
     """
     将期权信息转换为长桥期权代码格式
@@ -989,52 +1193,8 @@ def convert_to_longport_symbol(ticker: str, option_type: str, strike: float, exp
     Raises:
         ValueError: 如果期权已过期
     """
-    from datetime import datetime, timedelta
-    
     now = datetime.now()
-    expiry_date = None
-    
-    # 处理 "本周" 等中文到期日
-    if expiry in ["本周", "this week"]:
-        # 简化处理：使用本周五
-        days_until_friday = (4 - now.weekday()) % 7
-        if days_until_friday == 0:
-            days_until_friday = 7
-        expiry_date = now + timedelta(days=days_until_friday)
-        expiry = expiry_date.strftime("%m/%d")
-    
-    # 解析到期日
-    import re
-    if "/" in expiry:
-        # 格式：1/31 或 01/31
-        parts = expiry.split("/")
-        month, day = int(parts[0]), int(parts[1])
-        year = now.year
-        if month < now.month:
-            year += 1
-        expiry_date = datetime(year, month, day)
-        expiry_str = f"{year % 100:02d}{month:02d}{day:02d}"
-    else:
-        # 格式：2月13（中文）
-        m_yue_d = re.match(r"^(\d{1,2})月(\d{1,2})$", expiry.strip())
-        if m_yue_d:
-            month, day = int(m_yue_d.group(1)), int(m_yue_d.group(2))
-            year = now.year
-            if month < now.month:
-                year += 1
-            expiry_date = datetime(year, month, day)
-            expiry_str = f"{year % 100:02d}{month:02d}{day:02d}"
-        else:
-            # 假设格式：2025-01-31 或 20250131
-            expiry_clean = expiry.replace("-", "")
-            if len(expiry_clean) == 8 and expiry_clean.isdigit():
-                year = int(expiry_clean[:4])
-                month = int(expiry_clean[4:6])
-                day = int(expiry_clean[6:8])
-                expiry_date = datetime(year, month, day)
-                expiry_str = expiry_clean[-6:]  # YYMMDD
-            else:
-                raise ValueError(f"无法解析到期日格式: {expiry!r}，支持 1/31、2月13、2025-01-31、20250131")
+    expiry_date, expiry_str = _parse_expiry(expiry, now)
     
     # 检查期权是否已过期
     if expiry_date:
@@ -1049,13 +1209,15 @@ def convert_to_longport_symbol(ticker: str, option_type: str, strike: float, exp
     # 期权类型
     opt_type = "C" if option_type.upper() == "CALL" else "P"
     
+    return _build_option_symbol(ticker, opt_type, strike, expiry_str)
+
+
+@lru_cache(maxsize=4096)
+def _build_option_symbol(ticker: str, opt_type: str, strike: float, expiry_str: str) -> str:
+    """组合期权代码（纯格式化，按参数缓存；到期检查由调用方每次执行）。"""
     # 价格为行权价×1000，不补前导零。例：13.5 → 13500, 110 → 110000
-    strike_str = str(int(strike * 1000))
-    
-    # 组合期权代码
-    symbol = f"{ticker}{expiry_str}{opt_type}{strike_str}.US"
-    
-    return symbol
+    # 用 round 而非 int 截断，避免浮点误差（如 0.29 * 1000 = 289.99…）少 1
+    return f"{ticker}{expiry_str}{opt_type}{round(strike * 1000)}.US"
 
 
 def calculate_quantity(price: float, available_cash: float) -> int:
@@ -1069,9 +1231,7 @@ def calculate_quantity(price: float, available_cash: float) -> int:
     Returns:
         合约数量（至少 1 张，且不超过总价上限与资金允许的数量）
     """
-    import os
-    max_total = float(os.getenv('MAX_OPTION_TOTAL_PRICE', '10000'))
-    cap = min(max_total, available_cash)
+    cap = min(_MAX_OPTION_TOTAL_PRICE, available_cash)
     single_contract = price * 100  # 每张 100 股
     if single_contract <= 0:
         return 1
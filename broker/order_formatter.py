@@ -2,65 +2,164 @@
 订单输出格式化工具
 提供彩色表格展示订单信息
 """
-from typing import Dict, List, Optional, Tuple
-from rich.console import Console, Group
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from rich.console import Console, Group, RenderableType
 from rich.columns import Columns
 from rich.table import Table
 from rich.text import Text
+from rich.style import Style, StyleType
 from rich.live import Live
 from rich.spinner import Spinner
 from rich import box
+import atexit
+import os
+import queue
 import re
-from datetime import datetime
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
 
+# 不绑定具体 file：Console 每次写出时取当前 sys.stdout（兼容临时重定向与测试捕获）。
+# 多次 print 需合并写出时用 `with console:` 缓冲，退出时一次 write + flush。
 console = Console()
 
+# stdout 非终端（重定向到文件/日志采集）时，程序加载、网页监听与提示消息走纯文本输出，跳过 Rich 排版与样式渲染
+_IS_TTY = sys.stdout.isatty()
 
+# Rich markup 标签（与 rich.markup 规则一致：以小写字母、#、/、@ 开头）；前置单个反斜杠表示转义
+_MARKUP_TAG_RE = re.compile(r"(\\?)\[([a-z#/@][^\[\]]*)\]")
+
+
+def _strip_markup(s: str) -> str:
+    """去掉 Rich markup 标签并还原转义的 \\[ ，得到纯文本。"""
+    s = _MARKUP_TAG_RE.sub(lambda m: f"\\[{m.group(2)}]" if m.group(1) else "", s)
+    return s.replace("\\[", "[")
+
+
+# ASYNC_CONSOLE=true 时本模块的表格与消息输出交给后台线程写出（批处理脚本/日志采集场景），调用方不等待终端 I/O。
+# 所有输出经同一队列按提交顺序写出；RichLogger 的输出不经此队列，两者之间不保证先后。
+# OrderPrintBatcher 块内例外：Rich 的输出缓冲按线程区分，块内输出改在调用线程写入 console，与 RichLogger 一同缓冲。
+_ASYNC_CONSOLE = os.getenv("ASYNC_CONSOLE", "false").lower() == "true"
+_print_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+_print_thread: Optional[threading.Thread] = None
+# 当前线程所处 OrderPrintBatcher 块的嵌套层数
+_batch_local = threading.local()
+
+
+def _print_worker() -> None:
+    """后台输出线程：按顺序执行队列中的写出任务，收到 None 时退出。"""
+    while True:
+        task = _print_queue.get()
+        if task is None:
+            return
+        fn, args = task
+        try:
+            fn(*args)
+        except Exception as e:
+            sys.stderr.write(f"控制台输出失败: {e}\n")
+
+
+def _drain_print_queue() -> None:
+    """进程退出前写完队列中剩余的输出。"""
+    if _print_thread is not None:
+        _print_queue.put(None)
+        _print_thread.join(timeout=5)
+
+
+if _ASYNC_CONSOLE:
+    _print_thread = threading.Thread(target=_print_worker, name="console-print", daemon=True)
+    _print_thread.start()
+    atexit.register(_drain_print_queue)
+
+
+def _wait_print_queue() -> None:
+    """等待此前入队的输出全部写出（队列按顺序执行，排入一个标记任务即可）。"""
+    if _print_thread is not None:
+        done = threading.Event()
+        _print_queue.put((done.set, ()))
+        done.wait(timeout=5)
+
+
+def _submit(fn: Callable, *args) -> None:
+    """执行一次写出：异步模式下入队由后台线程执行（OrderPrintBatcher 块内除外），否则直接执行。"""
+    if _ASYNC_CONSOLE and not getattr(_batch_local, "depth", 0):
+        _print_queue.put((fn, args))
+    else:
+        fn(*args)
+
+
+def _emit(*objects) -> None:
+    """console.print 的统一出口（受 ASYNC_CONSOLE 控制）。"""
+    _submit(console.print, *objects)
+
+
+def _plain_print(*parts: str) -> None:
+    """非终端输出：去掉 markup 后直接写 stdout。"""
+    _submit(sys.stdout.write, _strip_markup(" ".join(parts)) + "\n")
+
+
+@lru_cache(maxsize=256)
 def _display_width(s: str) -> int:
-    """终端显示宽度：ASCII=1，CJK=2。"""
+    """终端显示宽度：ASCII=1，CJK=2。传入的多为固定标签，按字符串缓存。"""
     return len(s) + sum(1 for c in s if "\u4e00" <= c <= "\u9fff")
 
 
+# timedelta 整除得到整数毫秒，避免 total_seconds() 浮点乘法再取整
+_ONE_MS = timedelta(milliseconds=1)
+
+
+def _fmt_ts(now: datetime) -> str:
+    """格式化为 YYYY-MM-DD HH:MM:SS.mmm（isoformat 毫秒精度，与 strftime 拼接毫秒结果一致且更快）。"""
+    return now.isoformat(" ", "milliseconds")
+
+
 def _format_time_with_diff(timestamp_str: str, now: datetime) -> tuple:
     """返回 (显示时间，去掉 T 且毫秒 3 位；[+Nms] 的 rich 片段，<200ms 绿否则黄)。"""
     if not timestamp_str:
         return "", ""
     t = timestamp_str.replace("T", " ", 1).strip()
-    if "." in t:
-        idx = t.rfind(".")
-        t = t[: idx + 4] if len(t) > idx + 4 else t
+    idx = t.rfind(".")
+    if idx >= 0:
+        t = t[: idx + 4]
+    # 不足 "YYYY-MM-DD HH:MM:SS" 长度时无法计算时间差，直接返回
+    s = timestamp_str.replace("T ", "T").strip()[:23]
+    if len(s) < 19:
+        return t, ""
     try:
-        s = (timestamp_str or "").replace("T ", "T").strip()[:23]
-        if len(s) >= 19:
-            parsed = datetime.fromisoformat(s)
-            diff_ms = int((now - parsed).total_seconds() * 1000)
-            sign = "+" if diff_ms >= 0 else ""
-            ms_tag = f"[{sign}{diff_ms}ms]"
-            if abs(diff_ms) < 1000:
-                ms_rich = f"[green]{ms_tag}[/green]"
-            else:
-                ms_rich = f"[yellow]{ms_tag}[/yellow]"
-        else:
-            ms_rich = ""
+        # fromisoformat 在 CPython 3.11+ 为 C 实现，定长时间串解析比手工切片 int() 更快
+        parsed = datetime.fromisoformat(s)
+        diff_ms = (now - parsed) // _ONE_MS
     except Exception:
-        ms_rich = ""
+        return t, ""
+    sign = "+" if diff_ms >= 0 else ""
+    ms_tag = f"[{sign}{diff_ms}ms]"
+    if abs(diff_ms) < 1000:
+        ms_rich = f"[green]{ms_tag}[/green]"
+    else:
+        ms_rich = f"[yellow]{ms_tag}[/yellow]"
     return t, ms_rich
 
 
+def _order_summary(order: Dict, multiplier: int) -> str:
+    """提交订单摘要行：[方向] 代码，有价格时追加「单价 × 数量 = 总价」；无价格时不计算总价。"""
+    summary = f"[green]\\[{order.get('side', '')}][/green] {order.get('symbol', '')}"
+    price = order.get("price")
+    if price is None:
+        return summary
+    quantity = int(order.get("quantity") or 0)
+    total = float(price) * quantity * multiplier if price else 0.0
+    return summary + f" ${price} × {quantity} = [bold green]${total:.2f}[/bold green]"
+
+
 def print_order_submitting_display(order: Dict, multiplier: int = 100) -> None:
     """在调用 submit_order 之前展示「提交订单」阶段（时间点为即将提交），不包含 order_id。"""
     from utils.rich_logger import get_logger
     logger = get_logger()
-    symbol = order.get("symbol", "")
     mode = order.get("mode", "paper")
     mode_str = "模拟" if mode in ("paper", "dry_run") else "真实"
-    side = order.get("side", "")
-    price = order.get("price")
-    quantity = int(order.get("quantity") or 0)
-    total = (float(price) if price else 0) * quantity * multiplier
-    summary = f"[green]\\[{side}][/green] {symbol}"
-    if price is not None:
-        summary += f" ${price} × {quantity} = [bold green]${total:.2f}[/bold green]"
+    summary = _order_summary(order, multiplier)
     logger.trade_stage("提交订单", rows=[("", summary)],
                        tag_suffix=f"\\[{mode_str}]", tag_style="bold green")
 
@@ -73,14 +172,7 @@ def print_order_push_submitted_display(order: Dict, multiplier: int = 100) -> No
     if not order_id:
         return
     logger.trade_register_order(str(order_id))
-    symbol = order.get("symbol", "")
-    side = order.get("side", "")
-    price = order.get("price")
-    quantity = int(order.get("quantity") or 0)
-    total = (float(price) if price else 0) * quantity * multiplier
-    summary = f"[green]\\[{side}][/green] {symbol}"
-    if price is not None:
-        summary += f" ${price} × {quantity} = [bold green]${total:.2f}[/bold green]"
+    summary = _order_summary(order, multiplier)
     logger.trade_push_update(
         str(order_id),
         rows=[("OrderID", f"[dim]{order_id}[/dim]"), ("", summary)],
@@ -90,25 +182,61 @@ def print_order_push_submitted_display(order: Dict, multiplier: int = 100) -> No
     )
 
 
+class OrderPrintBatcher:
+    """
+    批量输出上下文：块内本模块与 RichLogger 的输出先缓冲，退出时一次写出。
+
+    用于一次性连续打印多笔订单（信号密集时），把 N 次终端写入合并为一次；
+    块内 RichLogger 临时改用本模块 console，保证两者输出顺序不变。
+    ASYNC_CONSOLE 模式下进入时先等待队列中已有输出写完，块内输出改在调用线程写入缓冲。
+    块内不要做耗时操作，否则输出会整体延后。
+
+    Example:
+        >>> with OrderPrintBatcher():
+        ...     for o in orders:
+        ...         print_order_submitted_display(o)
+    """
+
+    def __enter__(self) -> "OrderPrintBatcher":
+        from utils.rich_logger import get_logger
+        self._use_console = get_logger().use_console(console)
+        self._use_console.__enter__()
+        if _ASYNC_CONSOLE:
+            _wait_print_queue()
+        _batch_local.depth = getattr(_batch_local, "depth", 0) + 1
+        console.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        try:
+            console.__exit__(exc_type, exc_value, traceback)
+        finally:
+            _batch_local.depth -= 1
+            self._use_console.__exit__(exc_type, exc_value, traceback)
+
+
+def register_trade_order(order: Dict) -> None:
+    """
+    只把 order_id 注册到当前交易流程、不输出任何内容（静默模式下代替提交展示函数）。
+    未注册的订单收到成交/拒绝推送时 trade_push_update 会直接返回，推送与卖出利润都会丢失。
+    """
+    order_id = order.get("order_id")
+    if order_id:
+        from utils.rich_logger import get_logger
+        get_logger().trade_register_order(str(order_id))
+
+
 def print_order_submitted_display(order: Dict, multiplier: int = 100) -> None:
     """按表格格式输出订单提交成功信息（股票等：提交后展示，含 order_id）。期权买入已改为提交前展示 + 订单推送已提交。"""
     from utils.rich_logger import get_logger
     logger = get_logger()
-    symbol = order.get("symbol", "")
     mode = order.get("mode", "paper")
     mode_str = "模拟" if mode in ("paper", "dry_run") else "真实"
-    side = order.get("side", "")
-    price = order.get("price")
-    quantity = int(order.get("quantity") or 0)
-    total = (float(price) if price else 0) * quantity * multiplier
     order_id = order.get("order_id")
     rows = []
     if order_id:
         rows.append(("OrderID", f"[dim]{order_id}[/dim]"))
-    summary = f"[green]\\[{side}][/green] {symbol}"
-    if price is not None:
-        summary += f" ${price} × {quantity} = [bold green]${total:.2f}[/bold green]"
-    rows.append(("", summary))
+    rows.append(("", _order_summary(order, multiplier)))
     logger.trade_stage("提交订单", rows=rows,
                        tag_suffix=f"\\[{mode_str}]", tag_style="bold green")
     if order_id:
@@ -200,15 +328,14 @@ def print_program_load_display(lines: List[str]) -> None:
         - {时间} 长桥交易接口初始化
         - ...
     """
-    now = datetime.now()
-    ts = now.strftime("%Y-%m-%d %H:%M:%S") + f".{now.microsecond // 1000:03d}"
-    console.print(
-        f"[{_TS_STYLE}]{ts}[/{_TS_STYLE}]",
-        "[bold yellow][程序加载][/bold yellow]",
-    )
-    for line in lines:
-        console.print(f"    - [{_TS_STYLE}]{ts}[/{_TS_STYLE}] [dim white]{line}[/dim white]")
-    console.print()
+    ts = _fmt_ts(datetime.now())
+    if not _IS_TTY:
+        _plain_print("".join([f"{ts} [程序加载]\n"] + [f"    - {ts} {line}\n" for line in lines]))
+        return
+    # 整块组装为一个 Group；with console 缓冲到退出时一次写出并 flush
+    with console:
+        _emit(_render_live_block([(ts, line) for line in lines], ts, _TITLE_PROGRAM_LOAD))
+        _emit()
 
 
 def print_config_update_display(lines: List[str]) -> None:
@@ -241,22 +368,53 @@ def print_longbridge_data_display(lines: List[str]) -> None:
 
 def web_listen_timestamp() -> str:
     """当前时间戳，用于程序加载/网页监听每条子条目（与 block 标题同格式）。"""
-    now = datetime.now()
-    return now.strftime("%Y-%m-%d %H:%M:%S") + f".{now.microsecond // 1000:03d}"
+    return _fmt_ts(datetime.now())
 
 
 # 时间戳样式：用 grey70 显式灰色，避免在部分终端里 [dim] 显示为白色
 _TS_STYLE = "grey70"
 
+# 期权代码格式：TICKER + YYMMDD + C/P + PRICE（行权价×1000，不补零）.US
+_OPTION_RE = re.compile(r'^([A-Z]+)(\d{6})([CP])(\d+)')
+
+# 表格单元格常用样式，预先构建 Style 对象，渲染时无需再解析样式字符串
+_STYLE_BUY = Style(color="green", bold=True)
+_STYLE_SELL = Style(color="red", bold=True)
+_STYLE_CANCEL = Style(color="yellow", bold=True)
+_STYLE_SEARCH = Style(color="blue", bold=True)
+_STYLE_WHITE = Style(color="white")
+_STYLE_CYAN = Style(color="cyan")
+_STYLE_CHANGED = Style(color="yellow", bold=True)  # 改单变更项高亮
+_STYLE_FAILED = Style(color="red", bold=True)  # 失败原因
+_STYLE_TOTAL = Style(color="cyan", bold=True)
+_STYLE_GAIN = _STYLE_BUY  # 涨/盈利
+_STYLE_LOSS = _STYLE_SELL  # 跌/亏损
+_STYLE_ASSETS = Style(color="green", bold=True)  # 账户总资产
+_HEADER_STYLE = Style(color="magenta", bold=True)  # 列表类表格表头
+_SIDE_STYLES = {
+    "BUY": _STYLE_BUY,
+    "SELL": _STYLE_SELL,
+    "CANCEL": _STYLE_CANCEL,
+    "SEARCH": _STYLE_SEARCH,
+}
+# 已知方向的 Text 预先构建并共享（Table 只读引用单元格；调用方不得修改 format_side 返回的 Text）
+_SIDE_TEXTS = {side: Text(side, style=style) for side, style in _SIDE_STYLES.items()}
+# 无价格时的总价占位（共享实例，同样不得修改）
+_DASH_TEXT = Text("-", style=_STYLE_WHITE)
+
+# 块标题固定不变，预先构建 Text，Live 刷新时不再重复解析 markup
+_TITLE_PROGRAM_LOAD = Text("[程序加载]", style="bold yellow")
+_TITLE_WEB_LISTEN = Text("[网页监听]", style="bold yellow")
+
 
 def _render_live_block(
     lines: List[Tuple[str, str]],
     block_ts: str,
-    title: str,
+    title_text: Text,
     show_spinner: bool = False,
 ):
-    """供 rich.Live 使用的可刷新块：标题行 block_ts + title，每条子条目 (ts, line)。"""
-    header = Text.from_markup(f"[{_TS_STYLE}]{block_ts}[/{_TS_STYLE}] [bold yellow]{title}[/bold yellow]")
+    """供 rich.Live 使用的可刷新块：标题行 block_ts + title_text，每条子条目 (ts, line)。"""
+    header = Text.assemble((block_ts, _TS_STYLE), " ", title_text)
     if show_spinner:
         header = Columns([header, Spinner("dots")], expand=False)
     parts = [header]
@@ -271,7 +429,7 @@ def render_program_load_live(
     show_spinner: bool = False,
 ):
     """[程序加载] 流式块，含交易初始化与网页监听等全部子条目。"""
-    return _render_live_block(lines, block_ts, "[程序加载]", show_spinner)
+    return _render_live_block(lines, block_ts, _TITLE_PROGRAM_LOAD, show_spinner)
 
 
 def render_web_listen_live(
@@ -283,7 +441,7 @@ def render_web_listen_live(
     供 rich.Live 使用的 [网页监听] 可刷新渲染体。
     标题行显示 block_ts + [网页监听]；每条子条目为 (ts, line)，显示该条发生时间。
     """
-    return _render_live_block(lines, block_ts, "[网页监听]", show_spinner)
+    return _render_live_block(lines, block_ts, _TITLE_WEB_LISTEN, show_spinner)
 
 
 def print_web_listen_display(lines: List[Tuple[str, str]]) -> None:
@@ -291,13 +449,12 @@ def print_web_listen_display(lines: List[Tuple[str, str]]) -> None:
     网页监听展示。lines 为 (ts, line) 列表，每条显示该条发生时间。
     """
     block_ts = web_listen_timestamp() if not lines else lines[0][0]
-    console.print(
-        f"[{_TS_STYLE}]{block_ts}[/{_TS_STYLE}]",
-        "[bold yellow][网页监听][/bold yellow]",
-    )
-    for ts, line in lines:
-        console.print(f"    - [{_TS_STYLE}]{ts}[/{_TS_STYLE}] [dim white]{line}[/dim white]")
-    console.print()
+    if not _IS_TTY:
+        _plain_print("".join([f"{block_ts} [网页监听]\n"] + [f"    - {ts} {line}\n" for ts, line in lines]))
+        return
+    with console:
+        _emit(_render_live_block(lines, block_ts, _TITLE_WEB_LISTEN))
+        _emit()
 
 
 def print_sell_validation_display(
@@ -344,6 +501,7 @@ def print_close_validation_display(
     logger.trade_stage("订单校验", rows=rows, tag_style="bold yellow")
 
 
+@lru_cache(maxsize=4096)
 def parse_option_symbol(symbol: str) -> str:
     """
     解析期权代码为语义化名称
@@ -361,30 +519,24 @@ def parse_option_symbol(symbol: str) -> str:
         return symbol
     
     # 匹配期权代码格式：TICKER + YYMMDD + C/P + PRICE（行权价×1000，不补零）.US
-    pattern = r'^([A-Z]+)(\d{6})([CP])(\d+)'
-    match = re.match(pattern, symbol)
+    match = _OPTION_RE.match(symbol)
     
     if not match:
         return symbol
     
-    ticker = match.group(1)      # AAPL
-    date_str = match.group(2)    # 260207
-    option_type = match.group(3) # C or P
-    price_str = match.group(4)   # 行权价×1000，如 13500、250000
+    # ticker: AAPL；date_str: 260207；option_type: C or P；price_str: 行权价×1000，如 13500、250000
+    ticker, date_str, option_type, price_str = match.groups()
     
     # 解析日期（保持原格式 YYMMDD）
     formatted_date = date_str
     
-    # 解析价格（除以1000）
-    try:
-        price = int(price_str) / 1000
-        # 如果是整数，不显示小数点
-        if price == int(price):
-            formatted_price = f"${int(price)}"
-        else:
-            formatted_price = f"${price:.2f}".rstrip('0').rstrip('.')
-    except:
-        formatted_price = f"${price_str}"
+    # 解析价格（除以1000）；price_str 已由正则保证为数字串，int() 不会失败
+    price = int(price_str) / 1000
+    # 如果是整数，不显示小数点
+    if price == int(price):
+        formatted_price = f"${int(price)}"
+    else:
+        formatted_price = f"${price:.2f}".rstrip('0').rstrip('.')
     
     # 期权类型
     option_type_name = "CALL" if option_type == "C" else "PUT"
@@ -400,19 +552,13 @@ def format_side(side: str) -> Text:
         side: BUY/SELL/CANCEL/SEARCH
     
     Returns:
-        带颜色的 Text 对象
+        带颜色的 Text 对象（已知方向返回共享实例，不得修改）
     """
     side_upper = side.upper()
-    if side_upper == "BUY":
-        return Text(side_upper, style="bold green")
-    elif side_upper == "SELL":
-        return Text(side_upper, style="bold red")
-    elif side_upper == "CANCEL":
-        return Text(side_upper, style="bold yellow")
-    elif side_upper == "SEARCH":
-        return Text(side_upper, style="bold blue")
-    else:
-        return Text(side_upper, style="white")
+    text = _SIDE_TEXTS.get(side_upper)
+    if text is None:
+        return Text(side_upper, style=_STYLE_WHITE)
+    return text
 
 
 def format_price(price: Optional[float], market_text: str = "市价单") -> str:
@@ -432,7 +578,7 @@ def format_price(price: Optional[float], market_text: str = "市价单") -> str:
     return f"${price:.2f}"
 
 
-def format_total_value(price: Optional[float], quantity: int = 1, multiplier: int = 100, style: str = "bold cyan") -> Text:
+def format_total_value(price: Optional[float], quantity: int = 1, multiplier: int = 100, style: StyleType = _STYLE_TOTAL) -> Text:
     """
     格式化期权合约总价值（单价 x 数量 x 合约乘数）
     
@@ -440,16 +586,17 @@ def format_total_value(price: Optional[float], quantity: int = 1, multiplier: in
         price: 单价
         quantity: 数量（默认 1）
         multiplier: 合约乘数（默认 100）
-        style: 文本样式（默认 "bold cyan" 蓝色粗体）
+        style: 文本样式（默认 _STYLE_TOTAL 即 bold cyan 蓝色粗体；也可传样式字符串）
     
     Returns:
-        带颜色的 Text 对象，如 "$500.00" (蓝色)
+        带颜色的 Text 对象，如 "$500.00" (蓝色)；无价格时返回共享的 "-" 占位，不得修改
     """
     if price is None or price == 0:
-        return Text("-", style="white")
+        return _DASH_TEXT
     
     # 转换为 float 以避免 Decimal 类型问题
     total = float(price) * float(quantity) * multiplier
+    # 直接构造 Text 并复用模块级 Style：比返回 markup 字符串交给 Table 解析（Text.from_markup）快一个数量级
     return Text(f"${total:.2f}", style=style)
 
 
@@ -466,9 +613,9 @@ def format_change(old_value, new_value, show_change: bool = True) -> Text:
         带颜色的 Text 对象
     """
     if show_change and old_value != new_value:
-        return Text(f"{old_value} → {new_value}", style="bold yellow")
+        return Text(f"{old_value} → {new_value}", style=_STYLE_CHANGED)
     else:
-        return Text(str(new_value), style="white")
+        return Text(str(new_value), style=_STYLE_WHITE)
 
 
 def format_strategy(
@@ -501,232 +648,205 @@ def format_strategy(
     return " | ".join(strategies) if strategies else "-"
 
 
-def print_order_table(order: Dict, title: str = "订单信息"):
+def _table_title(text: str, style: Style) -> Text:
+    """单个订单表格标题：直接构建 Text（不经 markup 解析），保留 Rich 默认标题样式（table.title）作为底色"""
+    return Text.assemble((text, style), style="table.title")
+
+
+def _make_two_col_table(title: Text, border_style: str, value_width: int = 40) -> Table:
+    """单个订单详情使用的「字段 | 值」两列表格（无表头，粗边框）。"""
+    table = Table(title=title, show_header=False, show_edge=True, padding=(0, 1), border_style=border_style, box=box.HEAVY)
+    table.add_column(justify="left", style=_STYLE_CYAN, width=12)
+    table.add_column(justify="left", style=_STYLE_WHITE, width=value_width)
+    return table
+
+
+def _order_border_style(order: Dict) -> str:
+    """单个订单表格的边框颜色：BUY 蓝、SELL 绿、其他白（粗体）"""
+    side = order.get('side', '').upper()
+    if side == 'BUY':
+        return "bold blue"
+    if side == 'SELL':
+        return "bold green"
+    return "bold white"
+
+
+def _add_price_rows(table: Table, price: Optional[float], quantity, market_text: str = "市价单") -> None:
+    """添加「价格」（仅单价）与「总价」（蓝色）两行"""
+    table.add_row("价格", format_price(price, market_text))
+    table.add_row("总价", format_total_value(price, quantity))
+
+
+def _order_strategy(order: Dict) -> str:
+    """订单上的止盈止损策略描述"""
+    return format_strategy(
+        order.get('trigger_price'),
+        order.get('trailing_percent'),
+        order.get('trailing_amount')
+    )
+
+
+def _mode_display(mode: str) -> str:
+    """账户模式显示文本"""
+    return "🧪 模拟账户" if mode == "paper" else "💰 真实账户"
+
+
+def print_order_table(order: Dict):
     """
     以表格形式打印单个订单（单列展示，无字段名）
     
     Args:
         order: 订单信息字典
-        title: 表格标题
     """
+    get = order.get  # 同一订单多次取值，绑定一次 get
     # 获取期权语义化名称
-    symbol = order.get('symbol', '-')
+    symbol = get('symbol', '-')
     semantic_name = parse_option_symbol(symbol)
     
-    # 根据订单类型设置边框颜色
-    side = order.get('side', '').upper()
-    if side == 'BUY':
-        border_style = "bold blue"
-    elif side == 'SELL':
-        border_style = "bold green"
-    else:
-        border_style = "bold white"
-    
-    # 创建表格，使用语义化名称作为标题，带粗体彩色边框
-    table = Table(title=f"[bold cyan]{semantic_name}[/bold cyan]", show_header=False, show_edge=True, padding=(0, 1), border_style=border_style, box=box.HEAVY)
-    
-    # 添加两列
-    table.add_column(justify="left", style="cyan", width=12)
-    table.add_column(justify="left", style="white", width=40)
+    # 创建表格，使用语义化名称作为标题，按订单方向设置粗体彩色边框
+    table = _make_two_col_table(_table_title(semantic_name, _STYLE_TOTAL), _order_border_style(order))
     
     # 订单ID
-    order_id = order.get('order_id', '-')
+    order_id = get('order_id', '-')
     table.add_row("订单ID", order_id)
     
     # 期权名称（语义化）
     table.add_row("期权", semantic_name)
     
     # 操作方向（彩色）
-    side_text = format_side(order.get('side', '-'))
+    side_text = format_side(get('side', '-'))
     table.add_row("操作方向", side_text)
     
     # 数量
-    quantity = order.get('quantity', 0)
+    quantity = get('quantity', 0)
     table.add_row("数量", str(quantity))
     
-    # 价格（仅单价）
-    price = order.get('price')
-    price_str = format_price(price)
-    table.add_row("价格", price_str)
-    
-    # 总价（蓝色显示）
-    total_value = format_total_value(price, quantity)
-    table.add_row("总价", total_value)
+    # 价格（仅单价）与总价
+    _add_price_rows(table, get('price'), quantity)
     
     # 策略
-    strategy = format_strategy(
-        order.get('trigger_price'),
-        order.get('trailing_percent'),
-        order.get('trailing_amount')
-    )
-    table.add_row("策略", strategy)
+    table.add_row("策略", _order_strategy(order))
     
     # 状态
-    status = order.get('status', '-')
+    status = get('status', '-')
     table.add_row("状态", status)
     
     # 账户模式
-    mode = order.get('mode', '-')
-    mode_display = "🧪 模拟账户" if mode == "paper" else "💰 真实账户"
-    table.add_row("账户模式", mode_display)
+    table.add_row("账户模式", _mode_display(get('mode', '-')))
     
     # 备注
-    remark = order.get('remark')
+    remark = get('remark')
     if remark:
         table.add_row("备注", remark)
     
-    console.print(table)
+    _emit(table)
 
 
-def print_order_failed_table(order: Dict, error_msg: str, title: str = "订单失败"):
+def print_order_failed_table(order: Dict, error_msg: str):
     """
     以红色边框表格形式打印失败的订单
     
     Args:
         order: 订单信息字典
         error_msg: 错误信息
-        title: 表格标题
     """
+    get = order.get  # 同一订单多次取值，绑定一次 get
     # 获取期权语义化名称
-    symbol = order.get('symbol', '-')
+    symbol = get('symbol', '-')
     semantic_name = parse_option_symbol(symbol)
     
     # 创建表格，使用语义化名称作为标题，红色边框
-    table = Table(
-        title=f"[bold red]{semantic_name} - ❌ 订单失败[/bold red]", 
-        show_header=False, 
-        show_edge=True, 
-        padding=(0, 1), 
-        border_style="bold red",  # 红色边框
-        box=box.HEAVY
-    )
-    
-    # 添加两列
-    table.add_column(justify="left", style="cyan", width=12)
-    table.add_column(justify="left", style="white", width=40)
+    table = _make_two_col_table(_table_title(f"{semantic_name} - ❌ 订单失败", _STYLE_FAILED), "bold red")  # 红色边框
     
     # 期权名称（语义化）
     table.add_row("期权", semantic_name)
     
     # 操作方向（彩色）
-    side_text = format_side(order.get('side', '-'))
+    side_text = format_side(get('side', '-'))
     table.add_row("操作方向", side_text)
     
     # 数量
-    quantity = order.get('quantity', 0)
+    quantity = get('quantity', 0)
     table.add_row("数量", str(quantity))
     
-    # 价格（仅单价）
-    price = order.get('price')
-    price_str = format_price(price)
-    table.add_row("价格", price_str)
-    
-    # 总价（蓝色显示）
-    total_value = format_total_value(price, quantity)
-    table.add_row("总价", total_value)
+    # 价格（仅单价）与总价
+    _add_price_rows(table, get('price'), quantity)
     
     # 失败原因（红色高亮）
-    table.add_row("失败原因", Text(error_msg, style="bold red"))
+    table.add_row("失败原因", Text(error_msg, style=_STYLE_FAILED))
     
     # 账户模式
-    mode = order.get('mode', '-')
-    mode_display = "🧪 模拟账户" if mode == "paper" else "💰 真实账户"
-    table.add_row("账户模式", mode_display)
+    table.add_row("账户模式", _mode_display(get('mode', '-')))
     
     # 备注
-    remark = order.get('remark')
+    remark = get('remark')
     if remark:
         table.add_row("备注", remark)
     
-    console.print(table)
+    _emit(table)
 
 
-def print_order_search_table(order: Dict, title: str = "订单查询"):
+def print_order_search_table(order: Dict):
     """
     以表格形式打印查询到的订单（纵向两列展示，无列标题）
     
     Args:
         order: 订单信息字典
-        title: 表格标题（如果订单包含期权信息，会自动使用期权语义化名称）
     """
+    get = order.get  # 同一订单多次取值，绑定一次 get
     # 获取期权语义化名称
-    symbol = order.get('symbol', '-')
+    symbol = get('symbol', '-')
     semantic_name = parse_option_symbol(symbol)
     
-    # 根据订单类型设置边框颜色
-    side = order.get('side', '').upper()
-    if side == 'BUY':
-        border_style = "bold blue"
-    elif side == 'SELL':
-        border_style = "bold green"
-    else:
-        border_style = "bold white"
-    
-    # 创建表格，使用语义化名称作为标题，带粗体彩色边框
-    table = Table(title=f"[bold cyan]{semantic_name}[/bold cyan]", show_header=False, show_edge=True, padding=(0, 1), border_style=border_style, box=box.HEAVY)
-    
-    # 添加两列
-    table.add_column(justify="left", style="cyan", width=12)
-    table.add_column(justify="left", style="white", width=40)
+    # 创建表格，使用语义化名称作为标题，按订单方向设置粗体彩色边框
+    table = _make_two_col_table(_table_title(semantic_name, _STYLE_TOTAL), _order_border_style(order))
     
     # 订单ID
-    order_id = order.get('order_id', '-')
+    order_id = get('order_id', '-')
     table.add_row("订单ID", order_id)
     
     # 期权名称（原始代码）
     table.add_row("期权名称", symbol)
     
     # 操作方向（彩色）
-    side_text = format_side(order.get('side', '-'))
+    side_text = format_side(get('side', '-'))
     table.add_row("操作方向", side_text)
     
     # 数量（包含已成交）
-    quantity = order.get('quantity', 0)
-    executed_quantity = order.get('executed_quantity', 0)
+    quantity = get('quantity', 0)
+    executed_quantity = get('executed_quantity', 0)
     if executed_quantity:
         quantity_str = f"{executed_quantity}/{quantity}"
     else:
         quantity_str = str(quantity)
     table.add_row("数量", quantity_str)
     
-    # 价格（仅单价）
-    price = order.get('price')
-    price_str = format_price(price, market_text="市价")
-    table.add_row("价格", price_str)
-    
-    # 总价（蓝色显示）
-    total_value = format_total_value(price, quantity)
-    table.add_row("总价", total_value)
+    # 价格（仅单价）与总价
+    _add_price_rows(table, get('price'), quantity, market_text="市价")
     
     # 策略
-    strategy = format_strategy(
-        order.get('trigger_price'),
-        order.get('trailing_percent'),
-        order.get('trailing_amount')
-    )
-    table.add_row("策略", strategy)
+    table.add_row("策略", _order_strategy(order))
     
     # 状态
-    status = order.get('status', '-')
+    status = get('status', '-')
     table.add_row("状态", status)
     
     # 提交时间
-    submitted_at = order.get('submitted_at', '-')
+    submitted_at = get('submitted_at', '-')
     table.add_row("提交时间", submitted_at)
     
     # 备注
-    remark = order.get('remark')
+    remark = get('remark')
     if remark:
         table.add_row("备注", remark)
     
-    console.print(table)
+    _emit(table)
 
 
 def print_order_modify_table(
     order_id: str,
     old_order: Dict,
-    new_values: Dict,
-    title: str = "订单修改"
+    new_values: Dict
 ):
     """
     以表格形式打印订单修改信息（只显示变更项，黄色高亮）
@@ -735,21 +855,20 @@ def print_order_modify_table(
         order_id: 订单ID
         old_order: 原订单信息
         new_values: 新值
-        title: 表格标题
     """
     # 获取期权语义化名称
     symbol = old_order.get('symbol', '-')
     semantic_name = parse_option_symbol(symbol)
     
     # 创建表格，使用语义化名称作为标题，黄色粗体边框（表示修改操作）
-    table = Table(title=f"[bold cyan]{semantic_name}[/bold cyan]", 
+    table = Table(title=_table_title(semantic_name, _STYLE_TOTAL), 
                   show_header=False, 
                   border_style="bold yellow",
                   box=box.HEAVY)
     
-    table.add_column("字段", style="cyan", width=12)
-    table.add_column("原值", style="white", width=20)
-    table.add_column("新值", style="bold yellow", width=20)
+    table.add_column("字段", style=_STYLE_CYAN, width=12)
+    table.add_column("原值", style=_STYLE_WHITE, width=20)
+    table.add_column("新值", style=_STYLE_CHANGED, width=20)
     
     # 统计变更项数量
     changes_count = 0
@@ -767,7 +886,7 @@ def print_order_modify_table(
         table.add_row(
             "数量",
             str(old_qty),
-            Text(f"{old_qty} → {new_qty}", style="bold yellow")
+            Text(f"{old_qty} → {new_qty}", style=_STYLE_CHANGED)
         )
         changes_count += 1
     
@@ -781,7 +900,7 @@ def print_order_modify_table(
         table.add_row(
             "价格",
             old_price_str,
-            Text(f"{old_price_str} → {new_price_str}", style="bold yellow")
+            Text(f"{old_price_str} → {new_price_str}", style=_STYLE_CHANGED)
         )
         changes_count += 1
     
@@ -798,299 +917,268 @@ def print_order_modify_table(
             table.add_row(
                 "总价",
                 old_total_str,
-                Text(f"{old_total_str} → {new_total_str}", style="bold yellow")
+                Text(f"{old_total_str} → {new_total_str}", style=_STYLE_CHANGED)
             )
         else:
             # 总价未变化，但相关字段变了（理论上不会出现，但为了完整性）
             table.add_row(
                 "总价",
                 old_total_str,
-                Text(new_total_str, style="bold cyan")
+                Text(new_total_str, style=_STYLE_TOTAL)
             )
     
-    # 策略（只在有变更时显示）
-    old_strategy = format_strategy(
+    # 策略（只在有变更时显示）；策略参数未变时无需格式化比较
+    old_strategy_args = (
         old_order.get('trigger_price'),
         old_order.get('trailing_percent'),
         old_order.get('trailing_amount')
     )
-    new_strategy = format_strategy(
-        new_values.get('trigger_price', old_order.get('trigger_price')),
-        new_values.get('trailing_percent', old_order.get('trailing_percent')),
-        new_values.get('trailing_amount', old_order.get('trailing_amount'))
+    new_strategy_args = (
+        new_values.get('trigger_price', old_strategy_args[0]),
+        new_values.get('trailing_percent', old_strategy_args[1]),
+        new_values.get('trailing_amount', old_strategy_args[2])
     )
     
-    if old_strategy != new_strategy:
-        table.add_row(
-            "策略",
-            old_strategy,
-            Text(new_strategy, style="bold yellow")
-        )
-        changes_count += 1
+    if old_strategy_args != new_strategy_args:
+        old_strategy = format_strategy(*old_strategy_args)
+        new_strategy = format_strategy(*new_strategy_args)
+        if old_strategy != new_strategy:
+            table.add_row(
+                "策略",
+                old_strategy,
+                Text(new_strategy, style=_STYLE_CHANGED)
+            )
+            changes_count += 1
     
     # 显示表格
-    console.print(table)
+    _emit(table)
     
     # 显示变更总结
     if changes_count > 0:
-        console.print(f"[bold cyan]ℹ️  共修改 {changes_count} 个字段[/bold cyan]")
+        _emit(f"[bold cyan]ℹ️  共修改 {changes_count} 个字段[/bold cyan]")
     else:
-        console.print(f"[bold yellow]⚠️  未检测到变更[/bold yellow]")
+        _emit(f"[bold yellow]⚠️  未检测到变更[/bold yellow]")
 
 
-def print_order_cancel_table(order: Dict, title: str = "订单撤销"):
+def print_order_cancel_table(order: Dict):
     """
     以表格形式打印订单撤销信息（垂直两列展示：字段-值）
     
     Args:
         order: 订单信息字典
-        title: 表格标题
     """
+    get = order.get  # 同一订单多次取值，绑定一次 get
     # 获取期权语义化名称
-    symbol = order.get('symbol', '-')
+    symbol = get('symbol', '-')
     semantic_name = parse_option_symbol(symbol)
     
     # 创建表格，使用语义化名称作为标题，极浅灰色边框（表示撤销操作）
-    table = Table(title=f"[bold cyan]{semantic_name}[/bold cyan]", 
-                  show_header=False,
-                  border_style="dim white",  # 极浅灰色边框
-                  box=box.HEAVY)
-    
-    # 两列：字段和值
-    table.add_column("字段", style="cyan", width=12)
-    table.add_column("值", style="white", width=25)
+    # 两列：字段和值，极浅灰色边框
+    table = _make_two_col_table(_table_title(semantic_name, _STYLE_TOTAL), "dim white", value_width=25)
     
     # 订单ID
-    order_id = order.get('order_id', '-')
+    order_id = get('order_id', '-')
     table.add_row("订单ID", order_id)
     
     # 期权名称（原始代码）
     table.add_row("期权名称", symbol)
     
     # 操作
-    cancel_text = Text("CANCEL", style="bold yellow")
-    table.add_row("操作", cancel_text)
+    table.add_row("操作", _SIDE_TEXTS["CANCEL"])
     
     # 数量
-    quantity = order.get('quantity', 0)
+    quantity = get('quantity', 0)
     table.add_row("数量", str(quantity))
     
-    # 价格（仅单价）
-    price = order.get('price')
-    price_str = format_price(price, market_text="市价")
-    table.add_row("价格", price_str)
-    
-    # 总价（蓝色显示）
-    total_value = format_total_value(price, quantity)
-    table.add_row("总价", total_value)
+    # 价格（仅单价）与总价
+    _add_price_rows(table, get('price'), quantity, market_text="市价")
     
     # 状态
     table.add_row("状态", "已撤销")
     
     # 撤销时间
-    cancelled_at = order.get('cancelled_at', '-')
+    cancelled_at = get('cancelled_at', '-')
     table.add_row("撤销时间", cancelled_at)
     
-    console.print(table)
+    _emit(table)
 
 
-def print_orders_summary_table(orders: List[Dict], title: str = "订单列表"):
-    """
-    以表格形式打印多个订单的摘要
+_ORDER_STATUS_PREFIX = 'OrderStatus.'
+_ORDER_STATUS_PREFIX_LEN = len(_ORDER_STATUS_PREFIX)
+
+
+def _short_status(status: str) -> str:
+    """简化状态显示：去掉 "OrderStatus." 前缀"""
+    return status[_ORDER_STATUS_PREFIX_LEN:] if status.startswith(_ORDER_STATUS_PREFIX) else status
+
+
+# 订单摘要表列定义：(表头, 列样式, 宽度)
+_ORDERS_SUMMARY_COLUMNS: Tuple[Tuple[str, StyleType, int], ...] = (
+    ("期权", _STYLE_CYAN, 25),
+    ("方向", _STYLE_WHITE, 6),
+    ("数量", _STYLE_WHITE, 6),
+    ("价格", _STYLE_WHITE, 10),
+    ("总价", _STYLE_TOTAL, 12),
+    ("状态", _STYLE_WHITE, 20),
+)
+
+
+_ORDERS_SUMMARY_TITLE = "订单列表"
+_NO_ORDERS_DEFAULT = f"[yellow]{_ORDERS_SUMMARY_TITLE}: 无订单[/yellow]"
+
+
+def _print_no_orders(title: str) -> None:
+    """订单摘要为空时的提示（默认标题使用预先拼好的文本）"""
+    _emit(_NO_ORDERS_DEFAULT if title == _ORDERS_SUMMARY_TITLE else f"[yellow]{title}: 无订单[/yellow]")
+
+
+def _new_orders_summary_table(title: str) -> Table:
+    """创建订单摘要表（仅列定义，无数据行）"""
+    table = Table(title=title, show_header=True, header_style=_HEADER_STYLE, box=box.HEAVY)
+    for header, style, width in _ORDERS_SUMMARY_COLUMNS:
+        table.add_column(header, style=style, width=width)
+    return table
+
+
+def _orders_summary_row(order: Dict) -> tuple:
+    """订单摘要表的一行：期权、方向、数量、价格、总价、状态"""
+    g = order.get  # 同一订单多次取值，绑定一次 get
+    # 期权名称（语义化）
+    symbol = parse_option_symbol(g('symbol', '-'))
     
-    Args:
-        orders: 订单列表
-        title: 表格标题
-    """
-    if not orders:
-        console.print(f"[yellow]{title}: 无订单[/yellow]")
-        return
+    # 操作方向（彩色）
+    side_text = format_side(g('side', '-'))
     
-    table = Table(title=f"{title} (共 {len(orders)} 个)", show_header=True, header_style="bold magenta", box=box.HEAVY)
+    # 数量（包含已成交数量）
+    quantity = g('quantity', 0)
+    executed_quantity = g('executed_quantity')
+    if executed_quantity and executed_quantity > 0:
+        quantity_str = f"{executed_quantity}/{quantity}"
+    else:
+        quantity_str = str(quantity)
     
-    table.add_column("期权", style="cyan", width=25)
-    table.add_column("方向", style="white", width=6)
-    table.add_column("数量", style="white", width=6)
-    table.add_column("价格", style="white", width=10)
-    table.add_column("总价", style="bold cyan", width=12)
-    table.add_column("状态", style="white", width=20)
+    # 价格（仅单价）
+    price = g('price')
+    price_str = format_price(price, market_text="市价")
     
-    for order in orders:
-        # 期权名称（语义化）
-        symbol = parse_option_symbol(order.get('symbol', '-'))
-        
-        # 操作方向（彩色）
-        side_text = format_side(order.get('side', '-'))
-        
-        # 数量（包含已成交数量）
-        quantity = order.get('quantity', 0)
-        executed_quantity = order.get('executed_quantity')
-        if executed_quantity and executed_quantity > 0:
-            quantity_str = f"{executed_quantity}/{quantity}"
-        else:
-            quantity_str = str(quantity)
-        
-        # 价格（仅单价）
-        price = order.get('price')
-        price_str = format_price(price, market_text="市价")
-        
-        # 总价（蓝色显示）
-        total_value = format_total_value(price, quantity)
-        
-        # 状态（移除"OrderStatus."前缀，使其更简洁）
-        status = str(order.get('status', '-'))
-        status_display = status.replace('OrderStatus.', '')
-        
-        table.add_row(
-            symbol,
-            side_text,
-            quantity_str,
-            price_str,
-            total_value,
-            status_display
-        )
+    # 总价（蓝色显示）
+    total_value = format_total_value(price, quantity)
     
-    console.print(table)
+    # 状态（移除"OrderStatus."前缀，使其更简洁）
+    status_display = _short_status(str(g('status', '-')))
+    
+    return (symbol, side_text, quantity_str, price_str, total_value, status_display)
 
 
-def print_account_info_table(account_info: Dict, title: str = "账户信息"):
+def print_orders_summary_table(orders: List[Dict], title: str = _ORDERS_SUMMARY_TITLE):
     """
-    以表格形式打印账户信息（垂直两列展示：字段-值）
+    以表格形式打印多个订单的摘要
     
     Args:
-        account_info: 账户信息字典
+        orders: 订单列表
         title: 表格标题
     """
-    table = Table(title=title, show_header=True, header_style="bold magenta", box=box.HEAVY)
-    
-    # 两列：字段和值
-    table.add_column("字段", style="cyan", width=12)
-    table.add_column("值", style="white", width=20)
-    
-    # 获取数据
-    total_cash = account_info.get('total_cash', 0)
-    available_cash = account_info.get('available_cash', 0)
-    frozen_cash = total_cash - available_cash if total_cash and available_cash else 0
-    position_value = account_info.get('position_value', 0)
-    
-    # 计算现金比例
-    total_value = total_cash + position_value if total_cash and position_value else total_cash
-    cash_ratio = (total_cash / total_value * 100) if total_value > 0 else 0
+    if not orders:
+        _print_no_orders(title)
+        return
     
-    # 添加数据行
-    table.add_row("总资产", f"${total_cash:,.2f}")
-    table.add_row("可用资金", f"${available_cash:,.2f}")
-    table.add_row("冻结资金", f"${frozen_cash:,.2f}")
-    table.add_row("持仓市值", f"${position_value:,.2f}")
-    table.add_row("现金比例", f"{cash_ratio:.1f}%")
+    table = _new_orders_summary_table(f"{title} (共 {len(orders)} 个)")
+    add_row = table.add_row
+    for order in orders:
+        add_row(*_orders_summary_row(order))
     
-    console.print(table)
+    _emit(table)
+
 
+# 流式订单摘要表的最小刷新间隔（秒）：每行都重绘整表时开销随行数平方增长
+_STREAM_REFRESH_INTERVAL = 0.125
 
-def print_positions_table(positions: List[Dict], title: str = "持仓信息"):
+
+def print_orders_summary_table_streaming(orders: Iterable[Dict], title: str = _ORDERS_SUMMARY_TITLE):
     """
-    以表格形式打印持仓信息（横向多列展示汇总列表）
+    边接收边显示订单摘要（适用于逐条产出的迭代器/生成器，首行立即可见）
+    
+    已有完整列表时使用 print_orders_summary_table。非终端或 ASYNC_CONSOLE 模式下
+    无法原地刷新，退化为收齐后一次输出。
     
     Args:
-        positions: 持仓列表
+        orders: 订单迭代器
         title: 表格标题
     """
-    if not positions:
-        console.print(f"[yellow]{title}: 无持仓[/yellow]")
+    if not _IS_TTY or _ASYNC_CONSOLE:
+        print_orders_summary_table(list(orders), title)
         return
     
-    table = Table(title=f"{title} (共 {len(positions)} 个)", show_header=True, header_style="bold magenta", box=box.HEAVY)
-    
-    table.add_column("期权", style="cyan", width=30)
-    table.add_column("持仓数量", style="white", width=12)
-    table.add_column("可用数量", style="green", width=12)
-    table.add_column("成本价", style="white", width=12)
-    table.add_column("当前价", style="white", width=12)
-    table.add_column("盈亏", style="white", width=15)
-    table.add_column("盈亏率", style="white", width=10)
-    
-    for pos in positions:
-        # 期权名称（语义化）
-        symbol = parse_option_symbol(pos.get('symbol', '-'))
-        
-        # 持仓数量
-        quantity = pos.get('quantity', 0)
-        quantity_str = f"{quantity:,.0f}" if quantity else "-"
-        
-        # 可用数量
-        available_quantity = pos.get('available_quantity', 0)
-        available_str = f"{available_quantity:,.0f}" if available_quantity else "-"
-        
-        # 成本价
-        cost_price = pos.get('cost_price', 0)
-        cost_str = f"${cost_price:,.2f}" if cost_price else "-"
-        
-        # 当前价
-        current_price = pos.get('current_price', 0)
-        current_str = f"${current_price:,.2f}" if current_price else "-"
-        
-        # 盈亏
-        pnl = 0
-        pnl_percent = 0
-        pnl_style = "white"
-        
-        if cost_price and current_price and quantity:
-            pnl = (current_price - cost_price) * quantity
-            pnl_percent = ((current_price - cost_price) / cost_price * 100) if cost_price > 0 else 0
-            pnl_style = "bold green" if pnl >= 0 else "bold red"
-        
-        pnl_str = f"${pnl:+,.2f}" if pnl else "-"
-        pnl_percent_str = f"{pnl_percent:+.2f}%" if pnl_percent else "-"
-        
-        table.add_row(
-            symbol,
-            quantity_str,
-            available_str,
-            cost_str,
-            current_str,
-            Text(pnl_str, style=pnl_style),
-            Text(pnl_percent_str, style=pnl_style)
-        )
+    it = iter(orders)
+    first = next(it, None)
+    if first is None:
+        _print_no_orders(title)
+        return
     
-    console.print(table)
+    table = _new_orders_summary_table(f"{title} (共 1 个)")
+    table.add_row(*_orders_summary_row(first))
+    count = 1
+    # 手动刷新：行数据只在本线程修改，避免后台刷新线程读到半写入的表格
+    with Live(table, console=console, auto_refresh=False) as live:
+        live.refresh()
+        last_refresh = time.monotonic()
+        for order in it:
+            table.add_row(*_orders_summary_row(order))
+            count += 1
+            table.title = f"{title} (共 {count} 个)"
+            now = time.monotonic()
+            if now - last_refresh >= _STREAM_REFRESH_INTERVAL:
+                live.refresh()
+                last_refresh = now
+
+
+# 提示消息前缀与样式：消息按纯文本输出（不解析 markup），外部文本中的方括号原样显示
+_MSG_SUCCESS = ("✅ ", Style(color="green", bold=True))
+_MSG_ERROR = ("❌ ", Style(color="red", bold=True))
+_MSG_WARNING = ("⚠️  ", Style(color="yellow", bold=True))
+_MSG_INFO = ("ℹ️  ", Style(color="cyan", bold=True))
+
+
+def _print_message(kind: Tuple[str, Style], message: str) -> None:
+    """输出一条带图标的提示消息；非终端时直接写纯文本。"""
+    prefix, style = kind
+    line = prefix + str(message)
+    if not _IS_TTY:
+        _submit(sys.stdout.write, line + "\n")
+        return
+    _emit(Text(line, style=style))
 
 
 def print_success_message(message: str):
     """打印成功消息"""
-    console.print(f"[bold green]✅ {message}[/bold green]")
+    _print_message(_MSG_SUCCESS, message)
 
 
 def print_error_message(message: str):
     """打印错误消息"""
-    console.print(f"[bold red]❌ {message}[/bold red]")
+    _print_message(_MSG_ERROR, message)
 
 
 def print_warning_message(message: str):
     """打印警告消息"""
-    console.print(f"[bold yellow]⚠️  {message}[/bold yellow]")
+    _print_message(_MSG_WARNING, message)
 
 
 def print_info_message(message: str):
     """打印信息消息"""
-    console.print(f"[bold cyan]ℹ️  {message}[/bold cyan]")
+    _print_message(_MSG_INFO, message)
 
 
-def print_account_info_table(account_info: Dict, title: str = "账户信息"):
-    """
-    打印账户信息表格
+def _build_account_info_table(account_info: Dict, title: str) -> Table:
+    """构建账户信息表格（不输出）"""
+    table = Table(title=title, show_header=True, header_style=_HEADER_STYLE, box=box.HEAVY)
     
-    Args:
-        account_info: 账户信息字典
-        title: 表格标题
-    """
-    table = Table(title=title, show_header=True, header_style="bold magenta", box=box.HEAVY)
-    
-    table.add_column("项目", style="cyan", width=20)
-    table.add_column("金额", justify="right", style="white", width=20)
+    table.add_column("项目", style=_STYLE_CYAN, width=20)
+    table.add_column("金额", justify="right", style=_STYLE_WHITE, width=20)
     
     # 总资产
     total_cash = account_info.get('total_cash', 0)
-    table.add_row("总资产", Text(f"${total_cash:,.2f}", style="bold green"))
+    table.add_row("总资产", Text(f"${total_cash:,.2f}", style=_STYLE_ASSETS))
     
     # 可用资金
     available_cash = account_info.get('available_cash', 0)
@@ -1109,11 +1197,68 @@ def print_account_info_table(account_info: Dict, title: str = "账户信息"):
     table.add_row("币种", currency)
     
     # 账户模式
-    mode = account_info.get('mode', '-')
-    mode_display = "🧪 模拟账户" if mode == "paper" else "💰 真实账户"
-    table.add_row("账户模式", mode_display)
+    table.add_row("账户模式", _mode_display(account_info.get('mode', '-')))
+    return table
+
+
+def print_account_info_table(account_info: Dict, title: str = "账户信息"):
+    """
+    打印账户信息表格
     
-    console.print(table)
+    Args:
+        account_info: 账户信息字典
+        title: 表格标题
+    """
+    _emit(_build_account_info_table(account_info, title))
+
+
+# 列定义：(表头, 列样式, 宽度, 对齐, 取值函数)；取值函数接收一行 dict，返回单元格内容
+_ColumnSpec = Tuple[str, StyleType, int, str, Callable[[Dict], RenderableType]]
+
+
+def _render_table(title: str, rows: List[Dict], columns: Tuple[_ColumnSpec, ...]) -> Table:
+    """按列定义构建列表表格（标题附带条数）；rows 需非空"""
+    table = Table(title=f"{title} (共 {len(rows)} 个)", show_header=True, header_style=_HEADER_STYLE, box=box.HEAVY)
+    for header, style, width, justify, _ in columns:
+        table.add_column(header, style=style, width=width, justify=justify)
+    extractors = [col[4] for col in columns]
+    add_row = table.add_row
+    for row in rows:
+        add_row(*[extract(row) for extract in extractors])
+    return table
+
+
+def _position_market_value(pos: Dict) -> str:
+    """持仓市值：symbol 为期权代码（TICKER+YYMMDD+C/P+行权价）按合约乘数 100 计算，否则为正股"""
+    get = pos.get
+    symbol = get('symbol', '-')
+    quantity = get('quantity', 0)
+    cost_price = get('cost_price', 0)
+    if _OPTION_RE.match(symbol):
+        market_value = quantity * cost_price * 100
+    else:
+        market_value = quantity * cost_price
+    return f"${market_value:,.2f}"
+
+
+def _position_market(pos: Dict) -> str:
+    """市场（简化显示，去掉 "Market." 前缀）"""
+    market = pos.get('market', '-')
+    return str(market).replace('Market.', '') if market else '-'
+
+
+_POSITIONS_COLUMNS: Tuple[_ColumnSpec, ...] = (
+    ("代码/期权", _STYLE_CYAN, 30, "left", lambda pos: parse_option_symbol(pos.get('symbol', '-'))),
+    ("数量", "", 10, "right", lambda pos: str(int(pos.get('quantity', 0)))),
+    ("成本价", "", 14, "right", lambda pos: f"${pos.get('cost_price', 0):.2f}"),
+    ("市值", "", 16, "right", _position_market_value),
+    ("市场", "", 8, "center", _position_market),
+)
+
+
+def _build_positions_table(positions: List[Dict], title: str) -> Table:
+    """构建持仓信息表格（不输出）；positions 需非空"""
+    return _render_table(title, positions, _POSITIONS_COLUMNS)
 
 
 def print_positions_table(positions: List[Dict], title: str = "持仓列表"):
@@ -1127,48 +1272,44 @@ def print_positions_table(positions: List[Dict], title: str = "持仓列表"):
     if not positions:
         print_warning_message("暂无持仓")
         return
-    
-    table = Table(title=f"{title} (共 {len(positions)} 个)", show_header=True, header_style="bold magenta", box=box.HEAVY)
-    
-    table.add_column("代码/期权", style="cyan", width=30)
-    table.add_column("数量", justify="right", width=10)
-    table.add_column("成本价", justify="right", width=14)
-    table.add_column("市值", justify="right", width=16)
-    table.add_column("市场", justify="center", width=8)
-    
-    for pos in positions:
-        # 解析期权名称
-        symbol = pos.get('symbol', '-')
-        semantic_name = parse_option_symbol(symbol)
-        
-        # 数量
-        quantity = pos.get('quantity', 0)
-        
-        # 成本价
-        cost_price = pos.get('cost_price', 0)
-        cost_str = f"${cost_price:.2f}"
-        
-        # 市值（根据是否为期权判断乘数）
-        # 如果symbol包含期权特征（如 C/P），则使用100乘数，否则为正股
-        if 'C' in symbol or 'P' in symbol:
-            market_value = quantity * cost_price * 100  # 期权合约乘数100
-        else:
-            market_value = quantity * cost_price  # 正股
-        market_str = f"${market_value:,.2f}"
-        
-        # 市场（简化显示，去掉 "Market." 前缀）
-        market = pos.get('market', '-')
-        market_display = str(market).replace('Market.', '') if market else '-'
-        
-        table.add_row(
-            semantic_name,
-            str(int(quantity)),
-            cost_str,
-            market_str,
-            market_display
-        )
-    
-    console.print(table)
+    _emit(_build_positions_table(positions, title))
+
+
+# 涨跌标记按 change_pct >= 0 的布尔值索引：(跌, 涨)
+_CHANGE_MARKS = (("🔴", _STYLE_LOSS), ("🟢", _STYLE_GAIN))
+
+
+def _quote_change(quote: Dict) -> Text:
+    """涨跌幅（相对昨收），涨绿跌红"""
+    get = quote.get
+    prev_close = get('prev_close', 0)
+    change_pct = ((get('last_done', 0) - prev_close) / prev_close * 100) if prev_close > 0 else 0
+    icon, style = _CHANGE_MARKS[change_pct >= 0]
+    return Text(f"{icon} {change_pct:+.2f}%", style=style)
+
+
+def _quote_turnover(quote: Dict) -> str:
+    """成交额转换为百万显示"""
+    turnover = quote.get('turnover', 0)
+    turnover_m = turnover / 1_000_000 if turnover else 0
+    return f"${turnover_m:,.1f}M"
+
+
+_STOCK_QUOTES_COLUMNS: Tuple[_ColumnSpec, ...] = (
+    ("代码", _STYLE_CYAN, 12, "left", lambda quote: quote.get('symbol', '-')),
+    ("最新价", "", 11, "right", lambda quote: f"${quote.get('last_done', 0):.2f}"),
+    ("涨跌幅", "", 13, "right", _quote_change),
+    ("开盘", "", 11, "right", lambda quote: f"${quote.get('open', 0):.2f}"),
+    ("最高", "", 11, "right", lambda quote: f"${quote.get('high', 0):.2f}"),
+    ("最低", "", 11, "right", lambda quote: f"${quote.get('low', 0):.2f}"),
+    ("成交量", "", 13, "right", lambda quote: f"{quote.get('volume', 0):,}"),
+    ("成交额(M)", "", 11, "right", _quote_turnover),
+)
+
+
+def _build_stock_quotes_table(quotes: List[Dict], title: str) -> Table:
+    """构建股票报价表格（不输出）；quotes 需非空"""
+    return _render_table(title, quotes, _STOCK_QUOTES_COLUMNS)
 
 
 def print_stock_quotes_table(quotes: List[Dict], title: str = "股票报价"):
@@ -1182,49 +1323,41 @@ def print_stock_quotes_table(quotes: List[Dict], title: str = "股票报价"):
     if not quotes:
         print_warning_message("无报价数据")
         return
-    
-    table = Table(title=f"{title} (共 {len(quotes)} 个)", show_header=True, header_style="bold magenta", box=box.HEAVY)
-    
-    table.add_column("代码", style="cyan", width=12)
-    table.add_column("最新价", justify="right", width=11)
-    table.add_column("涨跌幅", justify="right", width=13)
-    table.add_column("开盘", justify="right", width=11)
-    table.add_column("最高", justify="right", width=11)
-    table.add_column("最低", justify="right", width=11)
-    table.add_column("成交量", justify="right", width=13)
-    table.add_column("成交额(M)", justify="right", width=11)
-    
-    for quote in quotes:
-        symbol = quote.get('symbol', '-')
-        last_done = quote.get('last_done', 0)
-        prev_close = quote.get('prev_close', 0)
-        open_price = quote.get('open', 0)
-        high = quote.get('high', 0)
-        low = quote.get('low', 0)
-        volume = quote.get('volume', 0)
-        turnover = quote.get('turnover', 0)
-        
-        # 计算涨跌幅
-        change_pct = ((last_done - prev_close) / prev_close * 100) if prev_close > 0 else 0
-        change_style = "bold green" if change_pct >= 0 else "bold red"
-        change_icon = "🟢" if change_pct >= 0 else "🔴"
-        change_str = f"{change_icon} {change_pct:+.2f}%"
-        
-        # 成交额转换为百万显示
-        turnover_m = turnover / 1_000_000 if turnover else 0
-        
-        table.add_row(
-            symbol,
-            f"${last_done:.2f}",
-            Text(change_str, style=change_style),
-            f"${open_price:.2f}",
-            f"${high:.2f}",
-            f"${low:.2f}",
-            f"{volume:,}",
-            f"${turnover_m:,.1f}M"
-        )
-    
-    console.print(table)
+    _emit(_build_stock_quotes_table(quotes, title))
+
+
+def _today_order_quantity(order: Dict) -> str:
+    """数量：有成交时显示 已成交/委托"""
+    get = order.get
+    quantity = get('quantity', 0)
+    executed_quantity = get('executed_quantity', 0)
+    return f"{int(executed_quantity)}/{int(quantity)}" if executed_quantity > 0 else str(int(quantity))
+
+
+def _today_order_time(order: Dict) -> str:
+    """提交时间：只显示 ISO 时间串中的时间部分"""
+    submitted_at = order.get('submitted_at', '-')
+    # 标准 ISO 串（YYYY-MM-DDTHH:MM:SS...）直接按位置切片，不分割字符串
+    if submitted_at[10:11] == 'T':
+        return submitted_at[11:19]
+    if submitted_at != '-' and 'T' in submitted_at:
+        return submitted_at.split('T')[1][:8]
+    return '-'
+
+
+_TODAY_ORDERS_COLUMNS: Tuple[_ColumnSpec, ...] = (
+    ("期权", _STYLE_CYAN, 25, "left", lambda order: parse_option_symbol(order.get('symbol', '-'))),
+    ("方向", "", 6, "center", lambda order: format_side(order.get('side', '-'))),
+    ("数量", "", 6, "right", _today_order_quantity),
+    ("价格", "", 10, "right", lambda order: format_price(order.get('price'), "市价")),
+    ("状态", "", 15, "center", lambda order: _short_status(order.get('status', '-'))),
+    ("提交时间", "", 10, "center", _today_order_time),
+)
+
+
+def _build_today_orders_table(orders: List[Dict], title: str) -> Table:
+    """构建当日订单表格（不输出）；orders 需非空"""
+    return _render_table(title, orders, _TODAY_ORDERS_COLUMNS)
 
 
 def print_today_orders_table(orders: List[Dict], title: str = "当日订单"):
@@ -1238,54 +1371,4 @@ def print_today_orders_table(orders: List[Dict], title: str = "当日订单"):
     if not orders:
         print_warning_message("今日暂无订单")
         return
-    
-    table = Table(title=f"{title} (共 {len(orders)} 个)", show_header=True, header_style="bold magenta", box=box.HEAVY)
-    
-    table.add_column("期权", style="cyan", width=25)
-    table.add_column("方向", justify="center", width=6)
-    table.add_column("数量", justify="right", width=6)
-    table.add_column("价格", justify="right", width=10)
-    table.add_column("状态", justify="center", width=15)
-    table.add_column("提交时间", justify="center", width=10)
-    
-    for order in orders:
-        # 解析期权名称
-        symbol = order.get('symbol', '-')
-        semantic_name = parse_option_symbol(symbol)
-        
-        # 操作方向
-        side = order.get('side', '-')
-        side_text = format_side(side)
-        
-        # 数量
-        quantity = order.get('quantity', 0)
-        executed_quantity = order.get('executed_quantity', 0)
-        quantity_str = f"{int(executed_quantity)}/{int(quantity)}" if executed_quantity > 0 else str(int(quantity))
-        
-        # 价格
-        price = order.get('price')
-        price_str = format_price(price, "市价")
-        
-        # 状态
-        status = order.get('status', '-')
-        # 简化状态显示
-        status_short = status.replace('OrderStatus.', '')
-        
-        # 提交时间
-        submitted_at = order.get('submitted_at', '-')
-        if submitted_at != '-' and 'T' in submitted_at:
-            # 只显示时间部分
-            time_part = submitted_at.split('T')[1][:8]
-        else:
-            time_part = '-'
-        
-        table.add_row(
-            semantic_name,
-            side_text,
-            quantity_str,
-            price_str,
-            status_short,
-            time_part
-        )
-    
-    console.print(table)
+    _emit(_build_today_orders_table(orders, title))
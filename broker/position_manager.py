@@ -3,21 +3,38 @@
 跟踪和管理期权持仓，计算盈亏，支持止损止盈。
 支持从 broker 同步账户余额、期权持仓及交易记录；订单推送时更新本地持仓与交易记录。
 """
+import atexit
+import os
 import re
+import sys
+import threading
+import time
+import weakref
 from decimal import Decimal
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 import json
 import logging
 
 from rich.console import Console
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # 未安装 orjson 时回退标准库 json
+
 from broker.order_formatter import print_position_update_display
 
 logger = logging.getLogger(__name__)
 console = Console()
 
+# Python 3.10+ 才支持 dataclass(slots=True)；3.9 下保持普通 dataclass
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# 持仓变更后延迟写盘的合并窗口（秒）：窗口内的多次变更只写一次文件
+_SAVE_DEBOUNCE_SECONDS = 0.5
+
 
 def _make_json_serializable(obj: Any) -> Any:
     """递归将 Decimal 等转为 JSON 可序列化类型。"""
@@ -30,6 +47,22 @@ def _make_json_serializable(obj: Any) -> Any:
     return obj
 
 
+def _write_json_file(path: str, data: Any) -> None:
+    """将数据写入临时文件后原子替换目标文件，避免写入中断留下半截 JSON。"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    payload = _make_json_serializable(data)
+    if orjson is not None:
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
 def _is_filled(status: Any) -> bool:
     """订单状态是否为已成交（Filled）。"""
     if status is None:
@@ -58,7 +91,7 @@ def _parse_option_symbol(symbol: str) -> Optional[tuple]:
     return (ticker, expiry, opt_type, strike)
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Position:
     """持仓信息"""
     symbol: str                    # 期权代码
@@ -86,16 +119,18 @@ class Position:
     updated_at: Optional[str] = None
     
     def to_dict(self) -> dict:
-        """转换为字典"""
-        return asdict(self)
+        """转换为字典（字段均为标量，按字段名浅拷贝即可，无需 asdict 递归复制）"""
+        return {name: getattr(self, name) for name in _POSITION_FIELD_NAMES}
     
-    def calculate_pnl(self, current_price: float = None, multiplier: int = 100):
+    def calculate_pnl(self, current_price: float = None, multiplier: int = 100,
+                      updated_at: Optional[str] = None):
         """
         计算盈亏
         
         Args:
             current_price: 当前价格（可选，默认使用对象的 current_price）
             multiplier: 合约乘数，期权 100（1 张=100 股），股票 1
+            updated_at: 更新时间（可选，批量更新时由调用方统一传入，默认取当前时间）
         """
         if current_price:
             self.current_price = current_price
@@ -109,7 +144,7 @@ class Position:
             self.unrealized_pnl_pct = (self.unrealized_pnl / cost) * 100
         else:
             self.unrealized_pnl_pct = 0.0
-        self.updated_at = datetime.now().isoformat()
+        self.updated_at = updated_at or datetime.now().isoformat()
     
     def should_stop_loss(self) -> bool:
         """是否触发止损"""
@@ -140,6 +175,10 @@ class Position:
         logger.info(f"调整止损: {self.symbol} {old_price} → {new_price}")
 
 
+_POSITION_FIELD_NAMES = tuple(f.name for f in fields(Position))
+_POSITION_FIELDS = frozenset(_POSITION_FIELD_NAMES)
+
+
 def _is_stock_symbol(symbol: str) -> bool:
     """是否为股票代码（非期权）。期权格式如 AAPL251220C150000.US，股票如 AAPL.US。"""
     return bool(symbol) and symbol.endswith(".US") and _parse_option_symbol(symbol) is None
@@ -159,6 +198,7 @@ class PositionManager:
         self.storage_file = storage_file
         self.is_stock_mode = is_stock_mode
         self.positions: Dict[str, Position] = {}
+        self._by_ticker: Optional[Dict[str, List[str]]] = None  # ticker -> symbols，持仓增删时置空、查询时重建
         self.account_balance: Optional[Dict[str, Any]] = None
         self.trade_records: Dict[str, List[Dict[str, Any]]] = {}  # symbol -> list of order/execution records
         self.last_sync_stats: Dict[str, Any] = {}  # 最近一次 sync_from_broker 的统计信息
@@ -166,13 +206,17 @@ class PositionManager:
             self._trade_records_file = "data/stock_trade_records.json"
         else:
             self._trade_records_file = storage_file.replace("positions.json", "trade_records.json") if "positions.json" in storage_file else "data/trade_records.json"
+        # 可重入：flush 持锁检查脏标记后在锁内调用 _save_positions
+        self._save_lock = threading.RLock()
+        self._dirty = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
         self._load_positions()
         self._load_trade_records()
+        _MANAGERS.add(self)
     
     def _load_trade_records(self):
         """从文件加载交易记录"""
         try:
-            import os
             if os.path.exists(self._trade_records_file):
                 with open(self._trade_records_file, "r", encoding="utf-8") as f:
                     self.trade_records = json.load(f)
@@ -184,22 +228,19 @@ class PositionManager:
     def _save_trade_records(self):
         """保存交易记录到文件"""
         try:
-            import os
-            os.makedirs(os.path.dirname(self._trade_records_file), exist_ok=True)
-            with open(self._trade_records_file, "w", encoding="utf-8") as f:
-                json.dump(_make_json_serializable(self.trade_records), f, indent=2, ensure_ascii=False)
+            _write_json_file(self._trade_records_file, self.trade_records)
         except Exception as e:
             logger.warning(f"保存交易记录失败: {e}")
     
     def _load_positions(self):
         """从文件加载持仓"""
         try:
-            import os
             if os.path.exists(self.storage_file):
                 with open(self.storage_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     for symbol, pos_data in data.items():
                         self.positions[symbol] = Position(**pos_data)
+                    self._by_ticker = None
                 logger.debug(f"加载持仓: {len(self.positions)} 个")
         except Exception as e:
             logger.error(f"加载持仓失败: {e}")
@@ -207,17 +248,42 @@ class PositionManager:
     def _save_positions(self):
         """保存持仓到文件"""
         try:
-            import os
-            os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
-            
-            data = {symbol: pos.to_dict() for symbol, pos in self.positions.items()}
-
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(_make_json_serializable(data), f, indent=2, ensure_ascii=False)
-            
-            logger.debug(f"保存持仓: {len(self.positions)} 个")
+            with self._save_lock:
+                # 先取快照：后台写盘时主线程可能同时增删持仓
+                data = {symbol: pos.to_dict() for symbol, pos in list(self.positions.items())}
+                _write_json_file(self.storage_file, data)
+            logger.debug(f"保存持仓: {len(data)} 个")
         except Exception as e:
             logger.error(f"保存持仓失败: {e}")
+
+    def _schedule_save(self):
+        """标记持仓已变更，由后台线程在合并窗口结束后统一写盘"""
+        self._dirty.set()
+        if self._flush_thread is None:
+            self._flush_thread = threading.Thread(
+                target=_position_flush_loop, args=(weakref.ref(self),),
+                name="position-flush", daemon=True
+            )
+            self._flush_thread.start()
+
+    def flush(self):
+        """
+        立即写出尚未保存的持仓变更（进程退出时自动调用）。
+
+        在写盘锁内检查并清除脏标记：后台线程正在保存时会等其写完再返回，
+        不会出现标记已清除、文件却尚未写出的窗口。
+        """
+        with self._save_lock:
+            if self._dirty.is_set():
+                self._dirty.clear()
+                self._save_positions()
+
+    def __del__(self):
+        # 管理器被回收时写出合并窗口内尚未落盘的变更
+        try:
+            self.flush()
+        except Exception:
+            pass
     
     def add_position(self, position: Position):
         """
@@ -227,7 +293,8 @@ class PositionManager:
             position: 持仓对象
         """
         self.positions[position.symbol] = position
-        self._save_positions()
+        self._by_ticker = None
+        self._schedule_save()
     
     def update_position(self, symbol: str, **kwargs):
         """
@@ -243,11 +310,13 @@ class PositionManager:
         
         position = self.positions[symbol]
         for key, value in kwargs.items():
-            if hasattr(position, key):
+            if key in _POSITION_FIELDS:
                 setattr(position, key, value)
         
+        if "ticker" in kwargs:
+            self._by_ticker = None
         position.updated_at = datetime.now().isoformat()
-        self._save_positions()
+        self._schedule_save()
         logger.debug(f"更新持仓: {symbol}")
     
     def sync_from_broker(self, broker: Any, full_refresh: bool = False,
@@ -272,6 +341,7 @@ class PositionManager:
         if not broker_positions:
             broker_positions = []
         multiplier = 1 if self.is_stock_mode else 100
+        now = datetime.now().isoformat()
         if self.is_stock_mode:
             relevant_positions = [p for p in broker_positions if _is_stock_symbol(p.get("symbol") or "")]
         else:
@@ -295,7 +365,7 @@ class PositionManager:
                 pos.available_quantity = avail
                 pos.avg_cost = cost
                 pos.current_price = cost
-                pos.calculate_pnl(multiplier=multiplier)
+                pos.calculate_pnl(multiplier=multiplier, updated_at=now)
             else:
                 pos = Position(
                     symbol=symbol,
@@ -310,12 +380,13 @@ class PositionManager:
                     market_value=cost * qty * multiplier,
                     unrealized_pnl=0.0,
                     unrealized_pnl_pct=0.0,
-                    updated_at=datetime.now().isoformat(),
+                    updated_at=now,
                 )
                 self.positions[symbol] = pos
         for symbol in list(self.positions.keys()):
             if not any(p.get("symbol") == symbol for p in relevant_positions):
                 del self.positions[symbol]
+        self._by_ticker = None
         def _symbol_relevant(s: str) -> bool:
             return _is_stock_symbol(s) if self.is_stock_mode else bool(_parse_option_symbol(s))
         relevant_symbols = set(self.positions.keys())
@@ -410,7 +481,7 @@ class PositionManager:
         for s in stale_symbols:
             del self.trade_records[s]
 
-        self._save_positions()
+        self._schedule_save()
         self._save_trade_records()
         self._log_sync_summary(config_lines=config_lines)
 
@@ -464,7 +535,6 @@ class PositionManager:
             self._save_trade_records()
             try:
                 # 等待券商系统更新持仓数据，避免查到旧数据
-                import time
                 time.sleep(0.5)
                 positions = broker.get_positions()
                 found_in_broker = False
@@ -909,7 +979,8 @@ class PositionManager:
         """
         if symbol in self.positions:
             del self.positions[symbol]
-            self._save_positions()
+            self._by_ticker = None
+            self._schedule_save()
     
     def get_position(self, symbol: str) -> Optional[Position]:
         """
@@ -958,6 +1029,7 @@ class PositionManager:
         
         # 券商持仓的 symbol 集合
         broker_symbols = set()
+        now = datetime.now().isoformat()
         
         for pos_data in broker_positions:
             symbol = pos_data['symbol']
@@ -970,7 +1042,7 @@ class PositionManager:
                 position.available_quantity = pos_data.get('available_quantity', position.available_quantity)
                 position.avg_cost = pos_data.get('cost_price', position.avg_cost)
                 position.market_value = pos_data.get('market_value', position.market_value)
-                position.calculate_pnl()
+                position.calculate_pnl(updated_at=now)
             else:
                 # 新持仓（可能是手动交易或其他渠道）
                 logger.warning(f"发现新持仓（未在本地记录）: {symbol}")
@@ -985,7 +1057,7 @@ class PositionManager:
             # 可以选择移除或标记为已平仓
             # self.remove_position(symbol)
         
-        self._save_positions()
+        self._schedule_save()
     
     def update_prices(self, price_updates: Dict[str, float]):
         """
@@ -994,11 +1066,18 @@ class PositionManager:
         Args:
             price_updates: {symbol: current_price} 字典
         """
+        get = self.positions.get
+        now = datetime.now().isoformat()  # 同一批次共用一个更新时间
+        updated = False
         for symbol, price in price_updates.items():
-            if symbol in self.positions:
-                self.positions[symbol].calculate_pnl(price)
+            position = get(symbol)
+            if position is not None:
+                position.calculate_pnl(price, updated_at=now)
+                updated = True
         
-        self._save_positions()
+        # 本批行情不含任何持仓时无需标记写盘
+        if updated:
+            self._schedule_save()
     
     def check_alerts(self) -> List[Dict]:
         """
@@ -1009,23 +1088,27 @@ class PositionManager:
         """
         alerts = []
         
+        # 单次遍历：每个持仓的价格与止损/止盈价只读取一次
         for position in self.positions.values():
-            if position.should_stop_loss():
+            price = position.current_price
+            stop_loss = position.stop_loss_price
+            take_profit = position.take_profit_price
+            if stop_loss is not None and price <= stop_loss:
                 alerts.append({
                     'type': 'STOP_LOSS',
                     'symbol': position.symbol,
-                    'current_price': position.current_price,
-                    'trigger_price': position.stop_loss_price,
+                    'current_price': price,
+                    'trigger_price': stop_loss,
                     'pnl': position.unrealized_pnl,
                     'pnl_pct': position.unrealized_pnl_pct
                 })
             
-            if position.should_take_profit():
+            if take_profit is not None and price >= take_profit:
                 alerts.append({
                     'type': 'TAKE_PROFIT',
                     'symbol': position.symbol,
-                    'current_price': position.current_price,
-                    'trigger_price': position.take_profit_price,
+                    'current_price': price,
+                    'trigger_price': take_profit,
                     'pnl': position.unrealized_pnl,
                     'pnl_pct': position.unrealized_pnl_pct
                 })
@@ -1061,7 +1144,14 @@ class PositionManager:
         Returns:
             持仓列表
         """
-        return [pos for pos in self.positions.values() if pos.ticker == ticker]
+        index = self._by_ticker
+        if index is None:
+            index = {}
+            for symbol, pos in self.positions.items():
+                index.setdefault(pos.ticker, []).append(symbol)
+            self._by_ticker = index
+        positions = self.positions
+        return [positions[symbol] for symbol in index.get(ticker, ())]
     
     def print_summary(self):
         """打印持仓摘要"""
@@ -1103,6 +1193,41 @@ class PositionManager:
         print("=" * 80 + "\n")
 
 
+# 存活的持仓管理器（弱引用，不延长其生命周期），进程退出时统一 flush
+_MANAGERS: "weakref.WeakSet[PositionManager]" = weakref.WeakSet()
+
+
+def _flush_all_managers() -> None:
+    """atexit 回调：写出所有存活管理器尚未保存的持仓变更"""
+    for manager in list(_MANAGERS):
+        manager.flush()
+
+
+atexit.register(_flush_all_managers)
+
+
+def _position_flush_loop(manager_ref: "weakref.ref[PositionManager]") -> None:
+    """
+    后台写盘循环：等待变更标记，窗口内的多次变更合并为一次保存。
+    只持有管理器的弱引用，管理器被回收后线程退出。
+    """
+    while True:
+        manager = manager_ref()
+        if manager is None:
+            return
+        dirty = manager._dirty
+        del manager
+        # 带超时等待，以便定期检查管理器是否已被回收
+        if not dirty.wait(1.0):
+            continue
+        time.sleep(_SAVE_DEBOUNCE_SECONDS)
+        manager = manager_ref()
+        if manager is None:
+            return
+        manager.flush()
+        del manager
+
+
 def create_position_from_order(
     symbol: str,
     ticker: str,
@@ -1150,8 +1275,6 @@ def create_position_from_order(
 
 if __name__ == "__main__":
     # 测试持仓管理器
-    import sys
-    
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(levelname)s - %(message)s'
@@ -175,6 +175,8 @@ class SignalScraper:
 
     def _on_order_changed(self, event):
         """长桥订单状态推送回调：更新本地持仓与交易记录，并处理未成交订单的止盈止损补偿任务"""
+        if self.broker:
+            self.broker.invalidate_prefetch()
         if self.position_manager and self.broker:
             try:
                 self.position_manager.on_order_push(event, self.broker)
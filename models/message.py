@@ -2,13 +2,15 @@
 消息组模型：单条消息及其关联上下文
 """
 import re
+from functools import lru_cache
 from typing import List, Dict
 from rich.console import Console
 from datetime import datetime
 
 
+@lru_cache(maxsize=256)
 def _display_width(s: str) -> int:
-    """终端显示宽度：ASCII=1，CJK=2。"""
+    """终端显示宽度：ASCII=1，CJK=2。传入的多为固定标签，按字符串缓存。"""
     return len(s) + sum(1 for c in s if "\u4e00" <= c <= "\u9fff")
 
 
@@ -218,7 +218,7 @@ def test_get_order_detail(broker: LongPortBroker, order_id: str):
             # 添加 mode 字段用于表格显示
             target_order['mode'] = 'paper' if broker.is_paper else 'real'
             
-            print_order_search_table(target_order, "订单查询")
+            print_order_search_table(target_order)
         else:
             print_warning_message(f"未找到订单: {order_id}")
         
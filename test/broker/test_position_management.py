@@ -208,7 +208,8 @@ def main():
         # 测试 4: 多持仓管理
         test_multiple_positions(manager)
         
-        # 测试 5: 移动止损
+        # 测试 5: 移动止损（新建的管理器从文件加载，先写出延迟保存的变更）
+        manager.flush()
         test_trailing_stop()
         
         # 最终摘要
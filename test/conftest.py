@@ -0,0 +1,14 @@
+"""
+pytest 公共配置
+
+test/broker、test/parser 带 __init__.py，pytest 按目录收集时会把 test/ 插到 sys.path 前部，
+并以 broker / parser 为名导入这两个测试包，遮蔽项目根目录下的同名包。
+这里在收集测试模块之前先导入项目包，使 `pytest test` 下各测试模块引用的都是项目代码。
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import broker  # noqa: E402,F401
+import parser  # noqa: E402,F401
@@ -0,0 +1,139 @@
+"""
+长桥接口纯函数单元测试
+
+验证到期日解析（_parse_expiry）与期权代码拼接（_build_option_symbol / convert_to_longport_symbol），
+不创建 TradeContext / QuoteContext，无需长桥账户配置。
+"""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+
+from broker.longport_broker import _build_option_symbol, _parse_expiry, convert_to_longport_symbol
+
+
+# ================================================================
+#  1. 到期日解析 _parse_expiry
+# ================================================================
+
+class TestParseExpiryThisWeek:
+    # 2026-03-16 为周一，依次到周日；本周五为 2026-03-20
+    @pytest.mark.parametrize("offset", range(7))
+    def test_this_week_each_weekday(self, offset):
+        """周一..周四取本周五，周五..周日取下一个周五（当天为周五时不取当天）"""
+        now = datetime(2026, 3, 16, 10, 30) + timedelta(days=offset)
+        expected = datetime(2026, 3, 20) if offset < 4 else datetime(2026, 3, 27)
+        expiry_date, expiry_str = _parse_expiry("本周", now)
+        assert expiry_date == expected
+        assert expiry_date.weekday() == 4
+        assert expiry_str == expected.strftime("%y%m%d")
+
+    def test_this_week_english(self):
+        """this week 与 本周 等价"""
+        now = datetime(2026, 3, 17, 9, 0)
+        assert _parse_expiry("this week", now) == _parse_expiry("本周", now)
+
+    def test_this_week_across_year(self):
+        """跨年：12 月最后一周的周五落在次年"""
+        now = datetime(2026, 12, 28, 15, 0)  # 周一
+        expiry_date, expiry_str = _parse_expiry("本周", now)
+        assert expiry_date == datetime(2027, 1, 1)
+        assert expiry_str == "270101"
+
+    def test_this_week_drops_time_of_day(self):
+        """到期日只保留日期部分"""
+        expiry_date, _ = _parse_expiry("本周", datetime(2026, 3, 16, 23, 59, 59))
+        assert (expiry_date.hour, expiry_date.minute, expiry_date.second) == (0, 0, 0)
+
+
+class TestParseExpiryMonthDay:
+    NOW = datetime(2026, 3, 16, 10, 0)
+
+    @pytest.mark.parametrize("text, expected", [
+        ("3/20", (datetime(2026, 3, 20), "260320")),
+        ("03/20", (datetime(2026, 3, 20), "260320")),
+        ("12/18", (datetime(2026, 12, 18), "261218")),
+        ("1/15", (datetime(2027, 1, 15), "270115")),  # 早于当前月份视为次年
+    ])
+    def test_slash(self, text, expected):
+        """M/D 与 MM/DD"""
+        assert _parse_expiry(text, self.NOW) == expected
+
+    def test_slash_with_year_suffix(self):
+        """M/D/YYYY 只取月日，年份按当前月份推算（与 M/D 一致）"""
+        assert _parse_expiry("4/17/2026", self.NOW) == _parse_expiry("4/17", self.NOW)
+        assert _parse_expiry("1/15/2027", self.NOW) == (datetime(2027, 1, 15), "270115")
+
+    @pytest.mark.parametrize("text, expected", [
+        ("2月13", (datetime(2027, 2, 13), "270213")),
+        ("3月20", (datetime(2026, 3, 20), "260320")),
+        ("12月18", (datetime(2026, 12, 18), "261218")),
+        (" 4月17 ", (datetime(2026, 4, 17), "260417")),
+    ])
+    def test_chinese_month_day(self, text, expected):
+        """中文 M月D"""
+        assert _parse_expiry(text, self.NOW) == expected
+
+
+class TestParseExpiryFullDate:
+    NOW = datetime(2026, 3, 16, 10, 0)
+
+    @pytest.mark.parametrize("text, expected", [
+        ("2026-04-17", (datetime(2026, 4, 17), "260417")),
+        ("2027-01-15", (datetime(2027, 1, 15), "270115")),
+        ("20260417", (datetime(2026, 4, 17), "260417")),
+        ("20250131", (datetime(2025, 1, 31), "250131")),  # 完整日期不做次年推算
+    ])
+    def test_full_date(self, text, expected):
+        """YYYY-MM-DD 与 YYYYMMDD"""
+        assert _parse_expiry(text, self.NOW) == expected
+
+    def test_irregular_hyphens(self):
+        """非定长的连字符写法去掉连字符后按 8 位数字解析"""
+        assert _parse_expiry("202604-17", self.NOW) == (datetime(2026, 4, 17), "260417")
+
+
+class TestParseExpiryErrors:
+    NOW = datetime(2026, 3, 16, 10, 0)
+
+    @pytest.mark.parametrize("text", ["", "next week", "2026-4", "2026041", "abcdefgh", "13月5x"])
+    def test_unparseable(self, text):
+        """无法识别的格式抛出 ValueError 并给出支持的格式"""
+        with pytest.raises(ValueError, match="无法解析到期日格式"):
+            _parse_expiry(text, self.NOW)
+
+    @pytest.mark.parametrize("text", ["2/30", "13/1", "2026-02-30", "2月30"])
+    def test_invalid_date(self, text):
+        """格式正确但日期不存在时由 datetime 抛出 ValueError"""
+        with pytest.raises(ValueError):
+            _parse_expiry(text, self.NOW)
+
+
+# ================================================================
+#  2. 期权代码拼接
+# ================================================================
+
+class TestBuildOptionSymbol:
+    @pytest.mark.parametrize("strike, expected", [
+        (0.29, "AAPL260417C290.US"),  # 0.29 * 1000 = 289.99…，不能截断为 289
+        (0.57, "AAPL260417C570.US"),
+        (13.5, "AAPL260417C13500.US"),
+        (110.0, "AAPL260417C110000.US"),
+        (2.3, "AAPL260417C2300.US"),
+    ])
+    def test_strike_rounding(self, strike, expected):
+        """行权价×1000 四舍五入取整，不补前导零"""
+        assert _build_option_symbol("AAPL", "C", strike, "260417") == expected
+
+    def test_convert_to_longport_symbol(self):
+        """完整转换：到期日解析 + 类型 + 行权价"""
+        assert convert_to_longport_symbol("EOSE", "PUT", 0.29, "2099-01-16") == "EOSE990116P290.US"
+        assert convert_to_longport_symbol("AAPL", "call", 150, "20990116") == "AAPL990116C150000.US"
+
+    def test_convert_expired_raises(self):
+        """已过期的到期日抛出 ValueError"""
+        with pytest.raises(ValueError, match="期权已过期"):
+            convert_to_longport_symbol("AAPL", "CALL", 150, "2020-01-17")
@@ -0,0 +1,196 @@
+"""
+订单/持仓格式化单元测试
+
+验证 broker.order_formatter 中表格单元格的计算与表格内容（输出写入 StringIO）。
+"""
+import sys
+import threading
+from io import StringIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+from rich.console import Console
+
+import broker.order_formatter as of
+import utils.rich_logger as rl
+from broker.order_formatter import (
+    OrderPrintBatcher, _position_market_value, print_info_message, print_order_table,
+    print_orders_summary_table, print_orders_summary_table_streaming, print_success_message,
+)
+from utils.rich_logger import RichLogger
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    """把模块 console 换成写入 StringIO 的 Console，返回读取输出的函数"""
+    buf = StringIO()
+    monkeypatch.setattr(of, "console", Console(file=buf, width=120, color_system=None))
+    return buf.getvalue
+
+
+# ================================================================
+#  1. 持仓市值
+# ================================================================
+
+class TestPositionMarketValue:
+    @pytest.mark.parametrize("symbol, expected", [
+        ("AAPL.US", "$1,505.00"),             # 正股不乘合约乘数
+        ("BRK.B.US", "$1,505.00"),
+        ("AAPL260417C150000.US", "$150,500.00"),  # 期权 1 张 = 100 股
+        ("EOSE260417P13500.US", "$150,500.00"),
+    ])
+    def test_multiplier_by_symbol(self, symbol, expected):
+        """期权按 ×100 计算，正股按数量 × 成本价"""
+        pos = {"symbol": symbol, "quantity": 10, "cost_price": 150.5}
+        assert _position_market_value(pos) == expected
+
+    def test_missing_fields(self):
+        """缺少数量/成本价时市值为 0"""
+        assert _position_market_value({"symbol": "AAPL.US"}) == "$0.00"
+
+
+# ================================================================
+#  2. 订单详情表格
+# ================================================================
+
+class TestOrderTableTitle:
+    def test_title_follows_symbol_without_mutating_order(self, captured):
+        """标题随 symbol 变化，且不向调用方的订单字典写入内部键"""
+        order = {"order_id": "1", "symbol": "AAPL260417C150000.US", "side": "BUY",
+                 "quantity": 1, "price": 1.0}
+        print_order_table(order)
+        first = captured()
+        order["symbol"] = "TSLA260417P200000.US"
+        print_order_table(order)
+        second = captured()[len(first):]
+        assert "AAPL 260417 $150 CALL" in first
+        assert "TSLA 260417 $200 PUT" in second and "AAPL" not in second
+        assert set(order) == {"order_id", "symbol", "side", "quantity", "price"}
+
+
+# ================================================================
+#  3. 批量输出 OrderPrintBatcher
+# ================================================================
+
+class _CountingIO(StringIO):
+    """记录 write 调用次数的 StringIO"""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+
+@pytest.fixture
+def batch_env(monkeypatch):
+    """模块 console 写入计数 StringIO；RichLogger 单例换成写入另一 StringIO 的实例"""
+    buf = _CountingIO()
+    monkeypatch.setattr(of, "console", Console(file=buf, width=120, color_system=None))
+    monkeypatch.setattr(of, "_IS_TTY", True)
+    logger = RichLogger(console=Console(file=StringIO(), width=120, color_system=None))
+    monkeypatch.setattr(rl, "_logger_instance", logger)
+    return buf, logger
+
+
+class TestOrderPrintBatcher:
+    def test_output_written_once_on_exit(self, batch_env):
+        """块内本模块与 RichLogger 的输出缓冲到退出时一次写出，顺序不变"""
+        buf, logger = batch_env
+        logger_file = logger.console.file
+        with OrderPrintBatcher():
+            logger.log("测试", "FIRST")
+            print_success_message("SECOND")
+            print_info_message("THIRD")
+            assert buf.getvalue() == ""
+        out = buf.getvalue()
+        assert buf.writes == 1
+        assert out.index("FIRST") < out.index("SECOND") < out.index("THIRD")
+        assert logger_file.getvalue() == ""
+
+    def test_logger_console_restored_on_exception(self, batch_env):
+        """块内抛出异常时 RichLogger 的 console 同样恢复，缓冲内容照常写出"""
+        buf, logger = batch_env
+        original = logger.console
+        with pytest.raises(RuntimeError):
+            with OrderPrintBatcher():
+                assert logger.console is of.console
+                print_success_message("BEFORE")
+                raise RuntimeError("boom")
+        assert logger.console is original
+        assert "BEFORE" in buf.getvalue()
+
+    def test_live_started_in_block_keeps_logger_console(self, batch_env):
+        """块内启动的交易流程 Live 绑定 RichLogger 原 console，退出后不残留在本模块 console 上"""
+        _, logger = batch_env
+        original = logger.console
+        with OrderPrintBatcher():
+            logger.trade_start("dom-1")
+        try:
+            assert logger._trade_live.console is original
+        finally:
+            logger.trade_end("dom-1")
+
+    def test_async_console_keeps_order(self, batch_env, monkeypatch):
+        """ASYNC_CONSOLE 下块前已入队的输出先写出，块内输出与 RichLogger 一同缓冲且顺序不变"""
+        buf, logger = batch_env
+        worker = threading.Thread(target=of._print_worker, daemon=True)
+        worker.start()
+        monkeypatch.setattr(of, "_ASYNC_CONSOLE", True)
+        monkeypatch.setattr(of, "_print_thread", worker)
+        try:
+            print_info_message("ZERO")
+            with OrderPrintBatcher():
+                logger.log("测试", "FIRST")
+                print_success_message("SECOND")
+                assert "FIRST" not in buf.getvalue() and "SECOND" not in buf.getvalue()
+        finally:
+            of._drain_print_queue()
+        out = buf.getvalue()
+        assert out.index("ZERO") < out.index("FIRST") < out.index("SECOND")
+        assert buf.writes == 2
+
+
+# ================================================================
+#  4. 流式订单摘要表
+# ================================================================
+
+def _summary_orders(n: int) -> list:
+    return [{"symbol": f"AAPL26041{i}C150000.US", "side": "BUY", "quantity": 1,
+             "price": 1.0, "status": "OrderStatus.New"} for i in range(n)]
+
+
+class TestOrdersSummaryStreaming:
+    def test_generator_on_tty(self, captured, monkeypatch):
+        """终端下逐条刷新，最终表格包含全部订单且标题计数正确"""
+        monkeypatch.setattr(of, "_IS_TTY", True)
+        monkeypatch.setattr(of, "_STREAM_REFRESH_INTERVAL", 0)
+        print_orders_summary_table_streaming(o for o in _summary_orders(3))
+        final = captured().rsplit("订单列表 (共", 1)[1]
+        assert final.startswith(" 3 个)")
+        for i in range(3):
+            assert f"AAPL 26041{i} $150 CALL" in final
+        assert "OrderStatus." not in final
+
+    def test_empty_iterator(self, captured, monkeypatch):
+        """空迭代器走 _print_no_orders"""
+        monkeypatch.setattr(of, "_IS_TTY", True)
+        calls = []
+        original = of._print_no_orders
+        monkeypatch.setattr(of, "_print_no_orders", lambda title: (calls.append(title), original(title)))
+        print_orders_summary_table_streaming(iter([]))
+        assert calls == ["订单列表"]
+        assert "订单列表: 无订单" in captured()
+
+    def test_non_tty_matches_summary_table(self, captured, monkeypatch):
+        """非终端下收齐后一次输出，与 print_orders_summary_table 一致"""
+        monkeypatch.setattr(of, "_IS_TTY", False)
+        orders = _summary_orders(3)
+        print_orders_summary_table(orders)
+        expected = captured()
+        print_orders_summary_table_streaming(o for o in orders)
+        assert captured()[len(expected):] == expected
@@ -0,0 +1,143 @@
+"""
+PositionManager 单元测试
+
+验证持仓变更的延迟合并写盘、flush 与后台线程的配合，以及管理器的回收。
+持仓文件写入 pytest 的 tmp_path，不触碰 data/ 目录。
+"""
+import gc
+import json
+import sys
+import threading
+import time
+import weakref
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+
+import broker.position_manager as pm
+from broker.position_manager import Position, PositionManager
+
+
+@pytest.fixture(autouse=True)
+def _short_debounce(monkeypatch):
+    """缩短合并窗口，避免测试等待过久"""
+    monkeypatch.setattr(pm, "_SAVE_DEBOUNCE_SECONDS", 0.05)
+
+
+def _make_position(symbol: str = "AAPL260117C150000.US", ticker: str = "AAPL") -> Position:
+    return Position(
+        symbol=symbol, ticker=ticker, option_type="CALL", strike=150.0, expiry="260117",
+        quantity=1, available_quantity=1, avg_cost=2.0, current_price=2.0,
+        market_value=200.0, unrealized_pnl=0.0, unrealized_pnl_pct=0.0,
+    )
+
+
+def _make_manager(tmp_path) -> PositionManager:
+    return PositionManager(storage_file=str(tmp_path / "positions.json"))
+
+
+def _count_writes(monkeypatch) -> list:
+    """统计 _write_json_file 的调用，返回记录写入路径的列表"""
+    calls = []
+    original = pm._write_json_file
+
+    def counting(path, data):
+        calls.append(path)
+        original(path, data)
+
+    monkeypatch.setattr(pm, "_write_json_file", counting)
+    return calls
+
+
+# ================================================================
+#  1. 延迟合并写盘
+# ================================================================
+
+class TestDebouncedSave:
+    def test_mutations_coalesce_into_one_write(self, tmp_path, monkeypatch):
+        """合并窗口内的多次变更只写一次文件，且包含全部变更"""
+        calls = _count_writes(monkeypatch)
+        manager = _make_manager(tmp_path)
+        for i in range(20):
+            manager.add_position(_make_position(f"AAPL2601{i:02d}C150000.US"))
+        assert calls == []
+        deadline = time.monotonic() + 2.0
+        while not calls and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        assert len(calls) == 1
+        data = json.loads((tmp_path / "positions.json").read_text(encoding="utf-8"))
+        assert len(data) == 20
+
+    def test_flush_writes_immediately(self, tmp_path):
+        """flush 立即写出未保存的变更"""
+        manager = _make_manager(tmp_path)
+        manager.add_position(_make_position())
+        manager.update_prices({"AAPL260117C150000.US": 3.0})
+        manager.flush()
+        data = json.loads((tmp_path / "positions.json").read_text(encoding="utf-8"))
+        assert data["AAPL260117C150000.US"]["current_price"] == 3.0
+        assert not manager._dirty.is_set()
+
+    def test_flush_waits_for_in_flight_save(self, tmp_path, monkeypatch):
+        """另一线程正在保存时 flush 等待其写完再返回"""
+        manager = _make_manager(tmp_path)
+        manager.positions["AAPL260117C150000.US"] = _make_position()
+        manager._dirty.set()
+
+        started, release, done = threading.Event(), threading.Event(), threading.Event()
+        original = pm._write_json_file
+
+        def slow_write(path, data):
+            started.set()
+            release.wait(2.0)
+            original(path, data)
+            done.set()
+
+        monkeypatch.setattr(pm, "_write_json_file", slow_write)
+        saver = threading.Thread(target=manager.flush)
+        saver.start()
+        assert started.wait(2.0)
+
+        returned = threading.Event()
+        waiter = threading.Thread(target=lambda: (manager.flush(), returned.set()))
+        waiter.start()
+        time.sleep(0.05)
+        assert not returned.is_set()
+
+        release.set()
+        saver.join(2.0)
+        waiter.join(2.0)
+        assert done.is_set() and returned.is_set()
+        assert (tmp_path / "positions.json").exists()
+
+
+# ================================================================
+#  2. 生命周期
+# ================================================================
+
+class TestLifecycle:
+    def test_manager_is_not_kept_alive(self, tmp_path):
+        """后台线程与退出回调只持有弱引用；回收时写出未保存的变更"""
+        manager = _make_manager(tmp_path)
+        manager.add_position(_make_position())
+        ref = weakref.ref(manager)
+        del manager
+        # 后台线程每轮只短暂持有强引用，稍等其释放
+        deadline = time.monotonic() + 2.0
+        while ref() is not None and time.monotonic() < deadline:
+            gc.collect()
+            time.sleep(0.01)
+        assert ref() is None
+        data = json.loads((tmp_path / "positions.json").read_text(encoding="utf-8"))
+        assert "AAPL260117C150000.US" in data
+
+    def test_flush_all_managers(self, tmp_path):
+        """退出回调写出所有存活管理器的变更"""
+        manager = _make_manager(tmp_path)
+        manager.add_position(_make_position())
+        pm._flush_all_managers()
+        assert (tmp_path / "positions.json").exists()
+        assert not manager._dirty.is_set()
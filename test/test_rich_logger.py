@@ -79,6 +79,16 @@ class TestLog:
         assert "[BUY]" in text
         assert "symbol=TEST.US" in text
 
+    def test_log_details_aligned_after_tag(self):
+        """details 缩进与 "时间戳 [tag] " 对齐（CJK 按双宽计算）"""
+        logger, output = _make_logger()
+        logger.log("订单校验", "header", details=["detail-line"])
+        lines = output().splitlines()
+        head = next(l for l in lines if "[订单校验]" in l)
+        detail = next(l for l in lines if "detail-line" in l)
+        expected = len(head.split("]", 1)[0]) + 1 + len("订单校验") + 1
+        assert detail.index("detail-line") == expected
+
     def test_log_custom_detail_style(self):
         """detail_style 为空时，details 的 rich markup 原样渲染"""
         logger, output = _make_logger()
@@ -159,6 +169,22 @@ class TestTagLive:
         assert data.lines[0][1] == "line1"
         logger.tag_live_stop("demo")
 
+    def test_tag_live_reuses_rendered_lines(self):
+        """刷新时已渲染的子行直接复用，只渲染新增行"""
+        logger, output = _make_logger()
+        logger.tag_live_start("复用")
+        logger.tag_live_append("复用", "行1")
+        data = logger.tag_live_get_data("复用")
+        first = data.parts[0]
+        logger.tag_live_append("复用", "行2", level=1)
+        logger.tag_live_refresh("复用")
+        assert len(data.parts) == 2
+        assert data.parts[0] is first
+        logger.tag_live_stop("复用")
+        text = output()
+        assert "行1" in text
+        assert "行2" in text
+
 
 # ================================================================
 #  3. 交易流程模式
@@ -27,7 +27,9 @@
     logger.trade_end()
 """
 import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, List, Optional, Callable, Tuple
 
 from rich import box
@@ -42,11 +44,22 @@ from rich.text import Text
 _TS_STYLE = "grey70"
 
 
+@lru_cache(maxsize=256)
 def _display_width(s: str) -> int:
-    """终端显示宽度：ASCII=1，CJK=2"""
+    """终端显示宽度：ASCII=1，CJK=2；传入的多为固定标签，按字符串缓存"""
     return len(s) + sum(1 for c in s if "\u4e00" <= c <= "\u9fff")
 
 
+# _now_ts() 输出定长 "YYYY-MM-DD HH:MM:SS.mmm"
+_TS_LEN = 23
+
+
+@lru_cache(maxsize=64)
+def _log_indent(tag: str) -> str:
+    """单条日志详情行缩进：与 "时间戳 [tag] " 对齐；tag 取值有限，按 tag 缓存。"""
+    return " " * (_TS_LEN + 1 + _display_width(f"[{tag}]") + 1)
+
+
 def _now_ts() -> str:
     now = datetime.now()
     return now.strftime("%Y-%m-%d %H:%M:%S") + f".{now.microsecond // 1000:03d}"
@@ -54,13 +67,15 @@ def _now_ts() -> str:
 
 class _TagData:
     """Live tag 内部状态"""
-    __slots__ = ("ts", "style", "lines", "show_spinner")
+    __slots__ = ("ts", "style", "lines", "show_spinner", "header", "parts")
 
     def __init__(self, ts: str, style: str, show_spinner: bool):
         self.ts = ts
         self.style = style
         self.lines: List[tuple] = []  # (timestamp, content, level)
         self.show_spinner = show_spinner
+        self.header: Optional[Text] = None  # 标题行 Text，首次渲染时构建
+        self.parts: List[Text] = []  # 与 lines 一一对应的已渲染子行，刷新时只渲染新增行
 
 
 class _TradeTableStage:
@@ -100,6 +115,8 @@ class RichLogger:
 
     def __init__(self, console: Optional[Console] = None):
         self._console = console or Console()
+        # Live 区域始终绑定初始化时的 console，不随 use_console 临时切换
+        self._live_console = self._console
         self._lock = threading.RLock()
 
         # Tag Live 状态
@@ -121,6 +138,21 @@ class RichLogger:
     def console(self) -> Console:
         return self._console
 
+    @contextmanager
+    def use_console(self, console: Console):
+        """
+        临时把静态输出改写到指定 console（如调用方正在缓冲的 console），退出时恢复（含异常退出）。
+        块内启动的 Tag Live / 交易流程 Live 仍绑定原 console，不会在恢复后残留在临时 console 上。
+        """
+        with self._lock:
+            previous = self._console
+            self._console = console
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._console = previous
+
     @staticmethod
     def timestamp() -> str:
         """当前时间戳 YYYY-MM-DD HH:MM:SS.mmm"""
@@ -144,7 +176,7 @@ class RichLogger:
             self._live = Live(
                 self._render_tag(tag),
                 refresh_per_second=6,
-                console=self._console,
+                console=self._live_console,
             )
             self._live.start()
 
@@ -193,13 +225,18 @@ class RichLogger:
     def _render_tag(self, tag: str) -> Group:
         """渲染 Live tag 的 renderable"""
         data = self._tags[tag]
-        header = Text.from_markup(
-            f"[{_TS_STYLE}]{data.ts}[/{_TS_STYLE}] [{data.style}]\\[{tag}][/{data.style}]"
-        )
+        header = data.header
+        if header is None:
+            header = data.header = Text.from_markup(
+                f"[{_TS_STYLE}]{data.ts}[/{_TS_STYLE}] [{data.style}]\\[{tag}][/{data.style}]"
+            )
         if data.show_spinner:
             header = Columns([header, Spinner("dots")], expand=False)
-        parts = [header]
-        for ts, line, level in data.lines:
+        # 子行只追加：已渲染的行直接复用，每次刷新只解析新增行的 markup
+        parts, lines = data.parts, data.lines
+        if len(parts) > len(lines):
+            parts.clear()
+        for ts, line, level in lines[len(parts):]:
             prefix = "    " + "  " * level + "- "
             if ts and level == 0:
                 parts.append(Text.from_markup(
@@ -209,7 +246,7 @@ class RichLogger:
                 parts.append(Text.from_markup(
                     f"{prefix}[dim white]{line}[/dim white]"
                 ))
-        return Group(*parts)
+        return Group(header, *parts)
 
     # ================================================================
     #  静态日志输出
@@ -246,8 +283,7 @@ class RichLogger:
                    header_extra: Optional[List[str]] = None) -> None:
         """直接打印一条日志到终端（无 Live）"""
         ts = _now_ts()
-        tag_display = f"[{tag}]"
-        indent = " " * (len(ts) + 1 + _display_width(tag_display) + 1)
+        indent = _log_indent(tag)
 
         parts = [
             f"[{_TS_STYLE}]{ts}[/{_TS_STYLE}]",
@@ -370,7 +406,7 @@ class RichLogger:
             self._trade_live = Live(
                 Text(""),
                 refresh_per_second=10,
-                console=self._console,
+                console=self._live_console,
             )
             self._trade_live.start()
 